@@ -1,14 +1,14 @@
 import os
+import shutil
+import itertools
 import numpy as np
 import pandas as pd
 import subprocess
 import argparse
-import psutil
-import time
 import typing as T
 from typing import Optional, Union, List, Tuple, Dict
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 
 """
 Novelty Calculation.
@@ -35,9 +35,8 @@ Batch Mode:
 """
 
 def pdbTM(
-    input: Union[str, Path],
+    input: Union[str, Path, List[Union[str, Path]]],
     foldseek_database_path: Union[str, Path],
-    process_id: int,
     save_tmp: bool = False,
     foldseek_path: Optional[Union[Path, str]] = None,
 ) -> Union[float, dict]:
@@ -45,8 +44,9 @@ def pdbTM(
     Calculate pdbTM values with a customized set of parameters by Foldseek.
     
     Args:
-    `input`: Input PDB file or csv file containing PDB paths.
-    `process_id`: Used for saving temporary files generated by Foldseek.
+    `input`: Input PDB file or a list of PDB files searched as one batch.
+             Batching amortizes the database load of Foldseek across all
+             queries instead of paying it once per PDB.
     `save_tmp`: If True, save tmp files generated by Foldseek, otherwise deleted after calculation.
     `foldseek_path`: Path of Foldseek binary file for executing the calculations.
                      If you've already installed Foldseek through conda, just use "foldseek"
@@ -62,41 +62,71 @@ def pdbTM(
     Returns:
     `top_pdbTM`: The highest pdbTM value among the top three targets hit by Foldseek.
     """
-    # Handling multiprocessing
+    # Handling multiprocessing: one stable tmp dir per worker process, so
+    # repeated Foldseek calls in the same worker keep its tmp state and the
+    # OS page cache on the database warm
     base_tmp_path = "../tmp/"
-    tmp_path = os.path.join(base_tmp_path, f'process_{process_id}')
+    tmp_path = os.path.join(base_tmp_path, f'process_{os.getpid()}')
     os.makedirs(tmp_path, exist_ok=True)
     
     #pdb100 = "~/zzq/foldseek/database/pdb100/pdb"
-    # Check whether input is a directory or a single file
-    if ".pdb" in input:
-        output_file = f'./{os.path.basename(input)}.m8'
-        
-        cmd = f'foldseek easy-search \
-                {input} \
-                {foldseek_database_path} \
-                {output_file} \
-                {tmp_path} \
-                --format-mode 4 \
-                --format-output query,target,evalue,alntmscore,rmsd,prob \
-                --alignment-type 1 \
-                --num-iterations 2 \
-                -e inf \
-                -v 0'
-                
-        if foldseek_path is not None:
-            cmd.replace('foldseek', {foldseek_path})
+    # Check whether input is a single file or a batch of files
+    single_input = isinstance(input, (str, Path))
+    if single_input:
+        if ".pdb" not in str(input):
+            return None
+        query_path = str(input)
+        output_file = f'./{os.path.basename(query_path)}.m8'
+    else:
+        # Symlink all queries of the batch into one directory so a single
+        # easy-search covers them with one database pass
+        query_path = os.path.join(tmp_path, 'queries')
+        os.makedirs(query_path, exist_ok=True)
+        for pdb in input:
+            link_path = os.path.join(query_path, os.path.basename(pdb))
+            if not os.path.exists(link_path):
+                os.symlink(os.path.abspath(pdb), link_path)
+        output_file = os.path.join(tmp_path, 'batch_result.m8')
 
-        _ = subprocess.run(cmd, shell=True, check=True, stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL)
-        
-        result = pd.read_csv(output_file, sep='\t')
-        top_pdbTM = round(result['alntmscore'].head(1).max(), 3)
-        
-        if save_tmp == False:
-            os.remove(output_file)
-            
+    binary = str(foldseek_path) if foldseek_path is not None else 'foldseek'
+    cmd = [
+        binary, 'easy-search',
+        str(query_path),
+        str(foldseek_database_path),
+        output_file,
+        tmp_path,
+        '--format-mode', '4',
+        '--format-output', 'query,target,evalue,alntmscore,rmsd,prob',
+        '--alignment-type', '1',
+        '--num-iterations', '2',
+        '--max-seqs', '3',
+        '-e', 'inf',
+        '-v', '0',
+    ]
+
+    _ = subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    
+    if single_input:
+        # Only the top hit matters; read the first data row instead of
+        # parsing every hit line into a DataFrame
+        with open(output_file) as f:
+            next(f) # Skip the header line written by --format-mode 4
+            top_line = next(f, None)
+        top_pdbTM = round(float(top_line.split('\t')[3]), 3) if top_line is not None else None
     else:
-        return None
+        result = pd.read_csv(output_file, sep='\t')
+        # Map Foldseek query names (file basenames) back to input paths
+        name_to_path = {os.path.splitext(os.path.basename(pdb))[0]: pdb for pdb in input}
+        top_hits = result.groupby('query')['alntmscore'].max().round(3)
+        top_pdbTM = {
+            name_to_path.get(query, query): value
+            for query, value in top_hits.items()
+        }
+    
+    if save_tmp == False:
+        os.remove(output_file)
+        if not single_input:
+            shutil.rmtree(query_path)
             
     return top_pdbTM
 
@@ -104,36 +134,43 @@ def calculate_novelty(
     input_csv: Union[str, Path, pd.DataFrame],
     foldseek_database_path: Union[str, Path],
     max_workers: int,
-    cpu_threshold: float 
+    batch_size: int = 64,
 ) -> pd.DataFrame:
     df = pd.read_csv(input_csv).copy() if isinstance(input_csv, str) or isinstance(input_csv, Path) else input_csv.copy()
     if 'pdbTM' not in df.columns:
         df.loc[:, 'pdbTM'] = None
         
-    futures = {}
+    # Index the first pdbTM per backbone once instead of scanning the whole
+    # column for every unique value
+    first_pdbTM = df.drop_duplicates('backbone_path').set_index('backbone_path')['pdbTM']
+    pending = first_pdbTM.index[first_pdbTM.isna()].tolist()
+    batches = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+    
+    pdbTM_values = {}
     if max_workers > 0:
         with ProcessPoolExecutor(max_workers=max_workers) as executor:
-            process_id = 0
-            for backbone_path in df['backbone_path'].unique():
-                if pd.isna(df[df['backbone_path'] == backbone_path]['pdbTM'].iloc[0]):
-                    while psutil.cpu_percent(interval=1) > cpu_threshold:
-                        time.sleep(0.5)
-                    future = executor.submit(pdbTM, backbone_path, foldseek_database_path, process_id)
-                    futures[future] = backbone_path
-                    process_id += 1
-                    
-            for future in as_completed(futures):
-                pdbTM_value = future.result()
-                backbone_path = futures[future]
-                df.loc[df['backbone_path'] == backbone_path, 'pdbTM'] = pdbTM_value
+            # Keep at most 2x max_workers batches in flight so queued task
+            # arguments and pending results stay O(max_workers), not O(N)
+            batch_iter = iter(batches)
+            futures = {
+                executor.submit(pdbTM, batch, foldseek_database_path): batch
+                for batch in itertools.islice(batch_iter, 2 * max_workers)
+            }
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    futures.pop(future)
+                    pdbTM_values.update(future.result())
+                    next_batch = next(batch_iter, None)
+                    if next_batch is not None:
+                        futures[executor.submit(pdbTM, next_batch, foldseek_database_path)] = next_batch
             
-            #df['pdbTM'] = df['backbone_path'].apply(lambda x: pdbTM_values[x])
     else:
-        for process_id_placeholder, backbone_path in enumerate(df['backbone_path'].unique()):
-            pdbTM_value = pdbTM(backbone_path, foldseek_database_path,
-                    process_id_placeholder)
-            df.loc[df['backbone_path'] == backbone_path, 'pdbTM'] = pdbTM_value
+        for batch in batches:
+            pdbTM_values.update(pdbTM(batch, foldseek_database_path))
             
+    # One vectorized hash lookup per row instead of a column scan per value
+    df['pdbTM'] = df['pdbTM'].fillna(df['backbone_path'].map(pdbTM_values))
     return df
 
 def create_parser():
@@ -157,6 +194,13 @@ def create_parser():
         default='novelty_results.csv',
         help='Output csv file',
     )
+    parser.add_argument(
+        '-w',
+        '--max-workers',
+        type=int,
+        default=os.cpu_count(),
+        help='Number of parallel Foldseek workers',
+    )
     return parser
     
 if __name__ == "__main__":
@@ -167,15 +211,17 @@ if __name__ == "__main__":
         raise ValueError('Cannot read csv file and single PDB file simultaneously!')
     
     if args.input is not None:
-        # Check hardware status
-        num_cpu_cores = os.cpu_count()
-        
         results = calculate_novelty(
             input_csv=args.input,
-            max_workers=num_cpu_cores,
-            cpu_threshold=75.0
+            max_workers=args.max_workers,
         )
-        results.to_csv(args.output, index=False)
+        try:
+            # pyarrow's C CSV writer avoids per-cell Python formatting
+            import pyarrow as pa
+            import pyarrow.csv as pv
+            pv.write_csv(pa.Table.from_pandas(results, preserve_index=False), args.output)
+        except ImportError:
+            results.to_csv(args.output, index=False)
     
     if args.calculate is not None:
         value = pdbTM(args.calculate)
@@ -66,18 +66,25 @@ def motif_scaffolding_pymol_write(
     cmd.color(native_motif_color,"native_motif")
     cmd.show("sticks","native_motif")
     
+    design_names = []
+    motif_selections = []
     for i in os.listdir(unique_designable_backbones):
         print(i)
         if i.endswith(".pdb"):
             name = i.split(".")[0]
             cmd.load(f"{unique_designable_backbones}/{i}",name)
-            cmd.color(design_scaffold_color,name)
+            design_names.append(name)
             motif_residue = design_name_motif[name]
-            cmd.select(f"{name}_motif","resi "+"+".join([str(i) for i in motif_residue])+" and "+name)
-            cmd.color(design_motif_color,f"{name}_motif")
-            cmd.show("sticks",f"{name}_motif")
-            # align the motif
-            cmd.align(f"{name}","native_motif")
+            motif_selections.append("(resi "+"+".join([str(i) for i in motif_residue])+" and "+name+")")
+
+    # Batch the styling: one PyMOL dispatch per operation for all designs
+    # instead of three calls per design
+    cmd.color(design_scaffold_color, " or ".join(design_names))
+    cmd.select("all_design_motifs", " or ".join(motif_selections))
+    cmd.color(design_motif_color, "all_design_motifs")
+    cmd.show("sticks", "all_design_motifs")
+    # align all the design motifs in one call
+    cmd.extra_fit("polymer", reference="native_motif", method="align")
 
     cmd.bg_color('white')
     # set grid_mode to 1
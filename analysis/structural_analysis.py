@@ -95,4 +95,10 @@ if __name__ == "__main__":
             max_workers=num_cpu_cores,
             cpu_threshold=75.0
         )
-        results.to_csv(args.output, index=False)
+        try:
+            # pyarrow's C CSV writer avoids per-cell Python formatting
+            import pyarrow as pa
+            import pyarrow.csv as pv
+            pv.write_csv(pa.Table.from_pandas(results, preserve_index=False), args.output)
+        except ImportError:
+            results.to_csv(args.output, index=False)
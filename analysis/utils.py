@@ -1,8 +1,9 @@
 import os
+import re
+import ast
 import numpy as np
 import subprocess
 import typing as T
-import random
 import shutil
 import json
 import logging
@@ -11,9 +12,10 @@ import pandas as pd
 from typing import Optional, Union, List, Tuple, Dict
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import mdtraj as md
-import MDAnalysis as mda
 import biotite
 import biotite.structure.io as strucio
 import biotite.structure as struc
@@ -23,13 +25,48 @@ from biotite.structure.residues import get_residues
 from biotite.structure import get_chains
 from biotite.sequence import ProteinSequence
 from biotite.sequence.io import fasta
+from joblib import Parallel, delayed
 from tmtools import tm_align
 from Bio.PDB.parse_pdb_header import parse_pdb_header
 from pymol import cmd
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # pyarrow's C++ CSV reader lexes in parallel, well ahead of pd.read_csv
+    import pyarrow.csv as pacsv
+except ImportError:
+    pacsv = None
+
 
 log = logging.getLogger(__name__)
 
+# Pulls the sample index out of colabfold output filenames in one match
+_PDB_SAMPLE_RE = re.compile(r'sample_(\d+)__score')
+
+# Backbone atom names shared by the extraction / RMSD helpers below
+BACKBONE_ATOMS = np.array(["N", "CA", "C", "O"])
+
+
+def _load_structure_cached(structure_path: str, model: int = 1) -> struc.AtomArray:
+    """Parse a structure file once and reuse it across the helpers below.
+
+    The returned AtomArray is shared between callers and must not be
+    mutated; slicing / boolean indexing (as done by all callers here)
+    always produces a new array.
+    """
+    # Resolve symlinks and relative spellings so every alias of a file
+    # shares one cache entry
+    return _load_structure_by_realpath(os.path.realpath(structure_path), model)
+
+
+@lru_cache(maxsize=128)
+def _load_structure_by_realpath(structure_path: str, model: int) -> struc.AtomArray:
+    return strucio.load_structure(structure_path, model=model)
+
 def reference_motif_extract(
     structure_path: Union[str, struc.AtomArray],
     atom_part: Optional[str] = "all-atom",
@@ -44,13 +81,12 @@ def reference_motif_extract(
         motif (biotite.structure.AtomArray): The motif positions extracted by user-specified way (all-atom / CA / backbone)
     """
     if isinstance(structure_path, str):
-        array = strucio.load_structure(structure_path, model=1)
+        array = _load_structure_cached(structure_path)
     else:
         array = structure_path
    
-    # Get unique chain IDs
-    chains = array.chain_id
-    unique_chains = sorted(set(chains))
+    # Get unique chain IDs (C-level sort, no Python set hashing)
+    unique_chains = np.unique(array.chain_id)
     
     result = []
     
@@ -74,7 +110,9 @@ def reference_motif_extract(
     # Join the results with slashes as required
     position = "/".join(result)
 
-    return motif_extract(position, structure_path, atom_part)
+    # Hand the already-parsed array on so motif_extract does not load the
+    # structure from disk a second time
+    return motif_extract(position, array, atom_part)
 
 
 
@@ -157,11 +195,15 @@ def motif_extract(
 
     position = position.split(split_char)
     if isinstance(structure_path, str):
-        array = strucio.load_structure(structure_path, model=1)
+        array = _load_structure_cached(structure_path)
     else:
         array = structure_path
 
-    motif_array = []
+    # Parse all motif segments first so the atom selection can be evaluated
+    # in one vectorized pass over the structure
+    chain_ids = []
+    starts = []
+    ends = []
     for i in position:
         chain_id = i[0]
         i = i.replace(chain_id, "")
@@ -170,18 +212,45 @@ def motif_extract(
         else:
             start, end = i.split("-")
             start, end = int(start), int(end)
+        chain_ids.append(chain_id)
+        starts.append(start)
+        ends.append(end)
+
+    chain_ids = np.asarray(chain_ids)
+    starts = np.asarray(starts)
+    ends = np.asarray(ends)
+
+    # Broadcast atoms against segments and OR the per-segment masks together,
+    # so the array is fancy-indexed exactly once instead of concatenating
+    # one sub-array per segment
+    segment_mask = (
+        (array.chain_id[:, None] == chain_ids[None, :])
+        & (array.res_id[:, None] >= starts[None, :])
+        & (array.res_id[:, None] <= ends[None, :])
+    ).any(axis=1)
+    motif_mask = segment_mask & (array.hetero == False)
+
+    if atom_part == "CA":
+        motif_mask &= (array.atom_name == "CA")
+    elif atom_part == "backbone":
+        motif_mask &= np.isin(array.atom_name, BACKBONE_ATOMS)
+
+    return array[motif_mask]
+
+@lru_cache(maxsize=256)
+def _filtered_backbone_cached(structure_path: str) -> struc.AtomArray:
+    """Amino-acid backbone atoms of a structure, filtered once per file.
+
+    rmsd() is typically called many times against the same native
+    reference; caching the filtered array skips the per-call mask build.
+    Must not be mutated by callers.
+    """
+    array = _load_structure_cached(structure_path)
+    # One np.isin pass replaces the four-way atom_name OR chain; note that
+    # struc.filter_peptide_backbone would drop the O atoms kept here
+    mask = np.isin(array.atom_name, BACKBONE_ATOMS) & struc.filter_amino_acids(array)
+    return array[mask]
 
-        if atom_part == "all-atom":
-            motif_array.append(array[(array.chain_id==chain_id) & (array.res_id <= end) & (array.res_id >= start) & (array.hetero==False)])
-        elif atom_part == "CA":
-            motif_array.append(array[(array.chain_id==chain_id) & (array.res_id <= end) & (array.res_id >= start) & (array.hetero==False) & (array.atom_name=="CA")])
-        elif atom_part == "backbone":
-            motif_array.append(array[(array.chain_id==chain_id) & (array.res_id <= end) & (array.res_id >= start) & (array.hetero==False) & ((array.atom_name=="N") | (array.atom_name=="CA")| (array.atom_name=="C") | (array.atom_name=="O"))])
-
-    motif = motif_array[0]
-    for i in range(len(motif_array) - 1):
-        motif += motif_array[i + 1]
-    return motif
 
 def rmsd(
     reference: Union[str, struc.AtomArray],
@@ -191,52 +260,97 @@ def rmsd(
 
     # Handle input protein type
     if isinstance(reference, str):
-        reference = strucio.load_structure(reference, model=1)
+        reference = _filtered_backbone_cached(reference)
+    else:
+        reference = reference[np.isin(reference.atom_name, BACKBONE_ATOMS) & struc.filter_amino_acids(reference)]
     if isinstance(target, str):
-        target = strucio.load_structure(target, model=1)
-
-    mask_reference = (((reference.atom_name == "N") | (reference.atom_name == "CA") | (reference.atom_name == "C") | (reference.atom_name == "O")) & (biotite.structure.filter_amino_acids(reference)))
-    reference = reference[mask_reference]
-    mask_target = (((target.atom_name == "N") | (target.atom_name == "CA") | (target.atom_name == "C") | (target.atom_name == "O")) & (biotite.structure.filter_amino_acids(target)) )
-    target = target[mask_target]
+        target = _filtered_backbone_cached(target)
+    else:
+        target = target[np.isin(target.atom_name, BACKBONE_ATOMS) & struc.filter_amino_acids(target)]
     superimposed, _ = struc.superimpose(reference, target)
     rms = struc.rmsd(reference, superimposed)
     return rms
 
+@lru_cache(maxsize=512)
+def _dssp_cached(path: str, mtime_ns: int, size: int) -> str:
+    """Run DSSP once per distinct file content.
+
+    The external DSSP call dominates the cost of secondary structure
+    analysis and the same PDB is scored repeatedly during multi-run
+    evaluation; mtime and size key the cache to the file content.
+    """
+    app = dssp.DsspApp(_load_structure_cached(path))
+    app.start()
+    app.join()
+    return "".join(app.get_sse())
+
+
+def batch_rmsd(pairs: List[Tuple[str, str]], n_jobs: int = -1) -> List[float]:
+    """Compute rmsd() for many (reference, target) path pairs in parallel.
+
+    The pairs are independent, so they fan out over a loky process pool;
+    each worker keeps its own structure / backbone caches warm across the
+    pairs it receives.
+    """
+    return Parallel(n_jobs=n_jobs, backend='loky', batch_size='auto')(
+        delayed(rmsd)(reference, target) for reference, target in pairs
+    )
+
+
+def batch_secondary_structure(paths: List[Union[str, Path]], n_jobs: int = -1) -> List[Optional[list]]:
+    """Run calculate_secondary_structure() over many PDBs in parallel."""
+    return Parallel(n_jobs=n_jobs, backend='loky', batch_size='auto')(
+        delayed(calculate_secondary_structure)(str(path)) for path in paths
+    )
+
+
 def calculate_secondary_structure(
     input: Union[str, struc.AtomArray] = None,
 ) -> Optional[list]:
     """
     Calculate protein secondary structure.
     """
-    array = strucio.load_structure(input)
-    app = dssp.DsspApp(array)
-    app.start()
-    app.join()
-    sse = app.get_sse()
-    sse_format = "".join(sse)
-
-    alpha_composition = (sse_format.count("H") + sse_format.count("G") + sse_format.count("I")) / len(sse_format) if len(sse_format) > 0 else 0
-    beta_composition = (sse_format.count("B") + sse_format.count("E")) / len(sse_format) if len(sse_format) > 0 else 0
-    coil_composition = (sse_format.count("C") + sse_format.count("S")) / len(sse_format) if len(sse_format) > 0 else 0
-    turn_composition = sse_format.count("T") / len(sse_format) if len(sse_format) > 0 else 0
+    if isinstance(input, str):
+        stat = os.stat(input)
+        sse_format = _dssp_cached(os.path.abspath(input), stat.st_mtime_ns, stat.st_size)
+    else:
+        app = dssp.DsspApp(input)
+        app.start()
+        app.join()
+        sse_format = "".join(app.get_sse())
+    length = len(sse_format)
+    if length == 0:
+        return [sse_format, 0, 0, 0, 0]
+
+    # Tally all SSE letters in one C pass instead of six str.count scans
+    counts = np.bincount(np.frombuffer(sse_format.encode('ascii'), dtype=np.uint8), minlength=256)
+    alpha_composition = (counts[ord("H")] + counts[ord("G")] + counts[ord("I")]) / length
+    beta_composition = (counts[ord("B")] + counts[ord("E")]) / length
+    coil_composition = (counts[ord("C")] + counts[ord("S")]) / length
+    turn_composition = counts[ord("T")] / length
 
     return [sse_format, alpha_composition, beta_composition, coil_composition, turn_composition]
 
+# Standard atomic masses for the elements occurring in protein structures
+_ELEMENT_MASSES = {'H': 1.008, 'C': 12.011, 'N': 14.007, 'O': 15.999, 'S': 32.06}
+
 def radius_of_gyration(
     input: str,
     atom_part: Optional[str] = "all-atom",
     ) -> float:
-    t = mda.Universe(input)
-    if atom_part == 'all-atom':
-        rg = t.atoms.radius_of_gyration()
+    # Computed directly on the cached AtomArray; building an MDAnalysis
+    # Universe here re-parsed the file on every call
+    array = _load_structure_cached(input)
     if atom_part == 'backbone':
-        backbone = t.select_atoms("backbone")
-        rg = backbone.atoms.radius_of_gyration()
-    if atom_part == 'CA':
-        c_alpha = t.select_atoms("name CA")
-        rg = c_alpha.atoms.radius_of_gyration()
-    return round(rg, 3)
+        array = array[np.isin(array.atom_name, BACKBONE_ATOMS)]
+    elif atom_part == 'CA':
+        array = array[array.atom_name == "CA"]
+    masses = np.array([_ELEMENT_MASSES.get(element, 0.0) for element in array.element])
+    coords = array.coord
+    total_mass = masses.sum()
+    com = (masses[:, None] * coords).sum(axis=0) / total_mass
+    rg = np.sqrt((masses * ((coords - com) ** 2).sum(axis=1)).sum() / total_mass)
+    return round(float(rg), 3)
 
 
 def calc_tm_score(pos_1, pos_2, seq_1, seq_2):
@@ -244,8 +358,37 @@ def calc_tm_score(pos_1, pos_2, seq_1, seq_2):
     return tm_results.tm_norm_chain1, tm_results.tm_norm_chain2
 
 def calc_aligned_rmsd(pos_1, pos_2):
-    aligned_pos_1 = rigid_transform_3D(pos_1, pos_2)[0]
-    return np.sqrt(np.mean(np.linalg.norm(aligned_pos_1 - pos_2, axis=-1) ** 2))
+    pos_1 = np.ascontiguousarray(pos_1, dtype=np.float64)
+    pos_2 = np.ascontiguousarray(pos_2, dtype=np.float64)
+    aligned_pos_1 = _kabsch(pos_1, pos_2)[0]
+    # Fused square-and-sum over the displacement; no intermediate norm array
+    diff = aligned_pos_1 - pos_2
+    return np.sqrt(np.einsum('ij,ij->', diff, diff) / diff.shape[0])
+
+
+def _kabsch(A, B):
+    # Transforms A to look like B. Same math as rigid_transform_3D but on
+    # (N, 3) row vectors directly, skipping the transpose round-trip, and
+    # compiled with numba when available (see below).
+    centroid_A = A.sum(axis=0) / A.shape[0]
+    centroid_B = B.sum(axis=0) / B.shape[0]
+    Am = A - centroid_A
+    Bm = B - centroid_B
+    H = Am.T @ Bm
+    U, S, Vt = np.linalg.svd(H)
+    R = Vt.T @ U.T
+    # Special reflection case
+    if np.linalg.det(R) < 0:
+        Vt[2, :] *= -1.0
+        R = Vt.T @ U.T
+    t = centroid_B - R @ centroid_A
+    return A @ R.T + t, R, t
+
+try:
+    from numba import njit
+    _kabsch = njit(cache=True, fastmath=True)(_kabsch)
+except ImportError:
+    pass
 
 def rigid_transform_3D(A, B, verbose=False):
     # Transforms A to look like B
@@ -354,22 +497,45 @@ def randomly_select_and_copy_pdb_files(src_folder, dst_folder, num_files):
     :param num_files: Number of PDB files to randomly select and copy.
     """
     # Get a list of all PDB files in the source folder
-    pdb_files = [file for file in os.listdir(src_folder) if file.endswith('.pdb')]
+    with os.scandir(src_folder) as entries:
+        pdb_files = [entry.name for entry in entries if entry.is_file() and entry.name.endswith('.pdb')]
 
     # Check if the source folder has enough files
     if len(pdb_files) < num_files:
         raise ValueError(f"Source folder has only {len(pdb_files)} files, but {num_files} files are requested.")
 
     # Randomly select the specified number of PDB files
-    selected_files = random.sample(pdb_files, num_files)
+    selected_files = np.random.default_rng().choice(pdb_files, size=num_files, replace=False).tolist()
 
     # Create the destination folder if it doesn't exist
-    if not os.path.exists(dst_folder):
-        os.makedirs(dst_folder)
+    Path(dst_folder).mkdir(parents=True, exist_ok=True)
+
+    def _link_or_copy(src, dst):
+        # A hardlink is pure metadata on the same filesystem; fall back to
+        # copying the bytes across devices
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy(src, dst)
+
+    # The transfers are I/O bound, so overlap them in a small thread pool
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for file in selected_files:
+            executor.submit(_link_or_copy, os.path.join(src_folder, file), os.path.join(dst_folder, file))
+
+def _read_af2_scores(json_path: Union[str, Path]) -> Dict:
+    """Load one AF2 score json and reduce it to mean pLDDT / pAE / pTM."""
+    if orjson is not None:
+        j = orjson.loads(Path(json_path).read_bytes())
+    else:
+        with open(json_path, 'r') as f:
+            j = json.load(f)
+    return {
+        'plddt': np.mean(j['plddt']),
+        'pae': np.mean(j['pae']),
+        'ptm': np.mean(j['ptm']),
+    }
 
-    # Copy each selected file to the destination folder
-    for file in selected_files:
-        shutil.copy(os.path.join(src_folder, file), os.path.join(dst_folder, file))
 
 def cleanup_af2_outputs(
     af2_dir: Union[str, Path],
@@ -378,48 +544,67 @@ def cleanup_af2_outputs(
 ) -> Dict:
 
     output_dict = {}
-    for file in os.listdir(af2_dir):
-        if file.endswith('.pdb'):
-            if file.startswith('T_0') == False: # original backbone sequence
-                new_path = os.path.join(path_to_store, 'sample_0.pdb')
-                shutil.copy2(os.path.join(af2_dir, file), new_path)
-                output_dict['sample_0'] = {}
-                output_dict['sample_0']['sample_path'] = os.path.abspath(new_path)
-            else: # Designed sequence
-                sample_index = os.path.splitext(file)[0].split('sample_')[1].split('__score')[0]
-                new_path = os.path.join(path_to_store, f'sample_{sample_index}.pdb')
-                shutil.copy2(os.path.join(af2_dir, file), new_path)
-                if f'sample_{sample_index}' not in output_dict:
-                    output_dict[f'sample_{sample_index}'] = {}
-                output_dict[f'sample_{sample_index}']['sample_path'] = os.path.abspath(new_path)
-        elif file.endswith('.json') and 'rank' in file: # file storing pLDDT & pTM & pAE
-            if file.startswith('T_0'):
-                sample_index = os.path.splitext(file)[0].split('sample_')[1].split('__score')[0]
-                if f'sample_{sample_index}' not in output_dict:
-                    output_dict[f'sample_{sample_index}'] = {}
-                with open(os.path.join(af2_dir, file), 'r') as f:
-                    j = json.load(f)
-                    output_dict[f'sample_{sample_index}']['plddt'] = np.mean(j['plddt'])
-                    output_dict[f'sample_{sample_index}']['pae'] = np.mean(j['pae'])
-                    output_dict[f'sample_{sample_index}']['ptm'] = np.mean(j['ptm'])
-            else: # original backbone sequence
-                if 'sample_0' not in output_dict:
-                    output_dict['sample_0'] = {}
-                with open(os.path.join(af2_dir, file), 'r') as f:
-                    j = json.load(f)
-                    output_dict['sample_0']['plddt'] = np.mean(j['plddt'])
-                    output_dict['sample_0']['pae'] = np.mean(j['pae'])
-                    output_dict['sample_0']['ptm'] = np.mean(j['ptm'])
+    copy_jobs = [] # (sample, source, destination)
+    score_jobs = [] # (sample, source)
+    with os.scandir(af2_dir) as entries:
+        for entry in entries:
+            file = entry.name
+            if file.endswith('.pdb'):
+                if file.startswith('T_0') == False: # original backbone sequence
+                    sample = 'sample_0'
+                else: # Designed sequence
+                    sample = f'sample_{_PDB_SAMPLE_RE.search(file).group(1)}'
+                copy_jobs.append((sample, entry.path, os.path.join(path_to_store, f'{sample}.pdb')))
+            elif file.endswith('.json') and 'rank' in file: # file storing pLDDT & pTM & pAE
+                if file.startswith('T_0'):
+                    sample = f'sample_{_PDB_SAMPLE_RE.search(file).group(1)}'
+                else: # original backbone sequence
+                    sample = 'sample_0'
+                score_jobs.append((sample, entry.path))
+
+    # Both the copies and the json parses are I/O bound; overlapping them in
+    # one thread pool hides most of the per-file disk latency
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        copy_futures = {
+            executor.submit(shutil.copy2, source, destination): (sample, destination)
+            for sample, source, destination in copy_jobs
+        }
+        score_futures = {
+            executor.submit(_read_af2_scores, source): sample
+            for sample, source in score_jobs
+        }
+        for future in as_completed([*copy_futures, *score_futures]):
+            if future in copy_futures:
+                sample, destination = copy_futures[future]
+                future.result()
+                output_dict.setdefault(sample, {})['sample_path'] = os.path.abspath(destination)
+            else:
+                sample = score_futures[future]
+                output_dict.setdefault(sample, {}).update(future.result())
     return output_dict
 
 def write_seqs_to_fasta(
     input_seqs: Union[Dict, list, str],
     fasta_path: Union[str, Path]
 ) -> None:
-    fasta_instance = fasta.FastaFile()
-    for header, string in input_seqs.items():
-        fasta_instance[header] = string
-    fasta_instance.write(fasta_path)
+    # Write the records directly through the buffered C writer; routing them
+    # through a FastaFile serializes entry by entry at Python speed
+    with open(fasta_path, 'w', buffering=1 << 20) as f:
+        f.writelines(f">{header}\n{string}\n" for header, string in input_seqs.items())
+
+@lru_cache(maxsize=8)
+def _load_motif_csv(csv_path: str, mtime_ns: int) -> pd.DataFrame:
+    """Parse a motif-info csv once and index it for O(1) (pdb_name, sample_num) lookups.
+
+    mtime keys the cache to the file content, so a rewritten csv is not
+    served stale. The cached frame is shared across calls and must not be
+    mutated.
+    """
+    wanted = {'pdb_name', 'sample_num', 'contig', 'redesign_positions'}
+    df = pd.read_csv(csv_path, usecols=lambda column: column in wanted)
+    df['sample_num'] = df['sample_num'].astype(np.int32)
+    return df.set_index(['pdb_name', 'sample_num'], drop=False).sort_index()
+
 
 def get_csv_data(
     csv_info: Union[str, Path],
@@ -441,26 +626,21 @@ def get_csv_data(
             motif_indices (str): List containing motif positions
             redesign_positions (str): Positions to be redesigned, segmented by ';'
     """
-    csv_info = pd.read_csv(csv_info)
-    csv_info['sample_num'] = csv_info['sample_num'].astype(int)
-    sample_item = csv_info[(csv_info['pdb_name'] == pdb_name) & (csv_info['sample_num'] == int(sample_num))]
-    if not sample_item.empty:
-        contig = sample_item['contig'].iloc[0]
-        length, motif_indices, motif_mask = generate_indices_and_mask(contig)
-        if 'motif_indices' not in csv_info.columns:
-            csv_info['motif_indices'] = None
-        if 'mask' not in csv_info.columns:
-            csv_info['mask'] = None
-
-        csv_info.at[sample_item.index[0], 'motif_indices'] = motif_indices
-        csv_info.at[sample_item.index[0], 'mask'] = motif_mask
-
-        return(
-            sample_item['contig'].iloc[0],
-            motif_mask,
-            motif_indices,
-            sample_item['redesign_positions'].iloc[0] if 'redesign_positions' in sample_item.columns and not pd.isna(sample_item['redesign_positions'].iloc[0]) else None
-        )
+    csv_info = _load_motif_csv(os.path.realpath(csv_info), os.stat(csv_info).st_mtime_ns)
+    try:
+        sample_item = csv_info.loc[(pdb_name, int(sample_num))]
+    except KeyError:
+        return None
+
+    contig = sample_item['contig']
+    length, motif_indices, motif_mask = generate_indices_and_mask(contig)
+
+    return(
+        contig,
+        motif_mask,
+        motif_indices,
+        sample_item['redesign_positions'] if 'redesign_positions' in csv_info.columns and not pd.isna(sample_item['redesign_positions']) else None
+    )
 
 
 def motif_indices_to_contig(motif_indices: Union[List, str]) -> str:
@@ -485,22 +665,17 @@ def motif_indices_to_contig(motif_indices: Union[List, str]) -> str:
     else:
         raise ValueError(f"Invalid input for motif_indices_to_contig: {motif_indices}")
 
-    sorted_indices = sorted(motif_indices)
-    contig = ""
-    range_start = None
-
-    for i, index in enumerate(sorted_indices):
-        if range_start is None:
-            range_start = index
-        if i == len(sorted_indices) - 1 or sorted_indices[i + 1] != index + 1:
-            if contig:
-                contig += "/"
-            if range_start == index:
-                contig += f"A{range_start}"
-            else:
-                contig += f"A{range_start}-{index}"
-            range_start = None
-    return contig
+    # Run-length encode the sorted indices: one segment per consecutive run
+    indices = np.sort(np.asarray(motif_indices, dtype=np.int32))
+    if indices.size == 0:
+        return ""
+    breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+    groups = np.split(indices, breaks)
+    parts = [
+        f"A{group[0]}" if group[0] == group[-1] else f"A{group[0]}-{group[-1]}"
+        for group in groups
+    ]
+    return "/".join(parts)
 
 def motif_indices_to_fixed_positions(motif_indices: Union[str, List]) -> str:
     """Converts motif indices to the fixed positions string format compatible with ProteinMPNN.
@@ -512,27 +687,46 @@ def motif_indices_to_fixed_positions(motif_indices: Union[str, List]) -> str:
     Returns:
         fix_positions (str): A str containing fixed positions seperated by space.
     """
-    # Converts motif indices to the fixed positions string format
-    if isinstance(motif_indices, list):
-        motif_indices = str(motif_indices)
-    motif_indices = motif_indices.strip('[]').split(', ')
-    motif_indices = sorted([int(index) for index in motif_indices])
-    fixed_positions = ' '.join(str(idx) for idx in motif_indices)
-    return f"{fixed_positions}"
+    # Converts motif indices to the fixed positions string format.
+    # List inputs no longer round-trip through repr; strings are parsed once
+    if not isinstance(motif_indices, list):
+        motif_indices = ast.literal_eval(motif_indices)
+    return ' '.join(str(index) for index in sorted(motif_indices))
+
+
+# Matches one contig segment: optional chain id, start and optional end
+_CONTIG_SEGMENT_RE = re.compile(r'([A-Z])?(\d+)(?:-(\d+))?')
+
+
+def _parse_contig_segments(contig: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Parse a contig-like string into parallel per-segment arrays.
+
+    Handles both '/'-separated contigs (e.g. "15/A45-65") and ';'-separated
+    position lists (e.g. "A10-15;A20") with one regex pass.
+
+    Returns:
+        chains / starts / ends / is_motif arrays, one entry per segment.
+        Scaffold segments carry an empty chain id and is_motif = False.
+    """
+    chains, starts, ends = [], [], []
+    for match in _CONTIG_SEGMENT_RE.finditer(contig):
+        chain, start, end = match.groups()
+        chains.append(chain or '')
+        starts.append(int(start))
+        ends.append(int(end) if end is not None else int(start))
+    chains = np.asarray(chains, dtype='U1')
+    starts = np.asarray(starts, dtype=np.int32)
+    ends = np.asarray(ends, dtype=np.int32)
+    return chains, starts, ends, chains != ''
 
 
 def parse_contig_string(contig_string):
     # Code by @blt2114
-    contig_segments = []
-    for motif_segment in contig_string.split(";"):
-        segment_dict ={"chain":motif_segment[0]}
-        if "-" in motif_segment:
-            segment_dict["start"], segment_dict["end"] = motif_segment[1:].split("-")
-
-        else:
-            segment_dict["start"] = segment_dict["end"] = motif_segment[1:]
-        contig_segments.append(segment_dict)
-    return contig_segments
+    chains, starts, ends, _ = _parse_contig_segments(contig_string)
+    return [
+        {"chain": chain, "start": str(start), "end": str(end)}
+        for chain, start, end in zip(chains.tolist(), starts.tolist(), ends.tolist())
+    ]
 
 
 def introduce_redesign_positions(
@@ -548,16 +742,14 @@ def introduce_redesign_positions(
     Returns:
         List: A list of fixed positions for ProteinMPNN, laterly as input for `motif_indices_to_fixed_positions`.
     """
-    if isinstance(fix_positions, list):
-        fix_positions = str(fix_positions)
+    if not isinstance(fix_positions, list):
+        fix_positions = ast.literal_eval(fix_positions)
 
-    pos_to_redesign = parse_contig_string(redesign_positions)
-    redesign_pos = []
-    for seg in pos_to_redesign:
-        for i in range(int(seg['start']), int(seg['end']) + 1):
-            redesign_pos.append(int(i))
-    final_pos = [pos for pos in eval(fix_positions) if pos not in redesign_pos]
-    return final_pos
+    # A set turns the membership test below into an O(1) hash lookup
+    redesign_pos = set()
+    for seg in parse_contig_string(redesign_positions):
+        redesign_pos.update(range(int(seg['start']), int(seg['end']) + 1))
+    return [pos for pos in fix_positions if pos not in redesign_pos]
 
 def generate_indices_and_mask(contig: str) -> Tuple[int, List[int], np.ndarray]:
     """Index motif and scaffold positions by contig for sequence redesign.
@@ -580,37 +772,22 @@ def generate_indices_and_mask(contig: str) -> Tuple[int, List[int], np.ndarray]:
             - motif_indices (List[int]): List of indices where motifs are located.
             - motif_mask (np.ndarray): Boolean array where True indicates motif positions and False for scaffold positions.
     """
-    ALPHABET = "ABCDEFGHJKLMNOPQRSTUVWXYZ"
-    components = contig.split('/')
-    current_position = 1  # Start positions at 1 for 1-based indexing
-    motif_indices = []
-    motif_mask = []
-
-    for part in components:
-        if part[0] in ALPHABET:
-            # Motif part
-            if '-' in part:
-                start, end = map(int, part[1:].split("-"))
-            else: # Single motif
-                start = end = int(part[1:])
-            length = (end - start + 1)
-            motif_indices.extend(range(current_position, current_position + length))
-            motif_mask.extend([True] * length)
-        else:
-            # Scaffold part
-            if '-' in part:
-                assert part.split('-')[0] == part.split('-')[-1]
-                length = int(part.split('-')[0])
-                #raise ValueError(f'There is "-" in scaffold {part}, which supposed to be determined already! Please check again.')
-            else:
-                length = int(part)
-            motif_mask.extend([False] * length)
-
-        current_position += length  # Update the current position after processing each part
-
-    # Convert motif_mask to a numpy array for more efficient boolean operations
-    motif_mask = np.array(motif_mask, dtype=bool)
-    overall_length = motif_mask.shape[0]
+    chains, starts, ends, is_motif = _parse_contig_segments(contig)
+    # Scaffold parts should be DETERMINISTIC: a range is only legal when
+    # both bounds agree (e.g. "20-20")
+    assert np.array_equal(starts[~is_motif], ends[~is_motif])
+    # Motif lengths span their residue range; a scaffold length is its number
+    lengths = np.where(is_motif, ends - starts + 1, starts).astype(np.int32)
+    motif_mask = np.repeat(is_motif, lengths)
+    overall_length = int(lengths.sum())
+
+    # 1-based start offset of every part, then one arange per motif segment
+    offsets = np.cumsum(lengths) - lengths + 1
+    motif_segments = [
+        np.arange(offset, offset + length)
+        for offset, length in zip(offsets[is_motif], lengths[is_motif])
+    ]
+    motif_indices = np.concatenate(motif_segments).tolist() if motif_segments else []
 
     return (overall_length, motif_indices, motif_mask)
 
@@ -626,17 +803,19 @@ def get_redesign_positions(pdb_path: Union[str, Path]) -> Tuple[List[int], List[
           redesign_positions (List[int]): Indices of positions to be redesigned inside biotite array object.
           redesign_chain_pos (List[str]): Indices integrated with chain information. Useful for further information storing.
     """
-    all_atom_array = strucio.load_structure(pdb_path)
+    all_atom_array = _load_structure_cached(pdb_path)
     ca_array = all_atom_array[(all_atom_array.atom_name == "CA")] # Get C-alpha array for convenience of indexing
 
-    # Get three lists to iterate
-    res_id_list = ca_array.res_id
-    chain_id_list = ca_array.chain_id
-    res_name_list = ca_array.res_name
+    # One boolean mask over the annotation arrays instead of zipping and
+    # filtering the residues in Python
+    unk_mask = ca_array.res_name == "UNK"
 
-    if 'UNK' in res_name_list:
-        redesign_positions = [index for index, resname in zip(res_id_list, res_name_list) if resname == "UNK"]
-        redesign_chain_positions = [f"{chain_id_list[idx]}{res_id_list[idx]}" for idx, resname in enumerate(res_name_list) if resname == "UNK"]
+    if unk_mask.any():
+        redesign_positions = ca_array.res_id[unk_mask].tolist()
+        redesign_chain_positions = [
+            f"{chain_id}{res_id}"
+            for chain_id, res_id in zip(ca_array.chain_id[unk_mask], ca_array.res_id[unk_mask])
+        ]
 
         formatted_chain_positions = format_chain_positions(redesign_chain_positions)
 
@@ -684,11 +863,13 @@ def write_contig_into_header(
     header_string = f"HEADER    {contig:<40}{date:>9}\n"
     save_path = output_path if output_path is not None else pdb_path
 
-    with open(pdb_path, "r") as f:
-        file_lines = f.readlines()
-        file_lines.insert(0, header_string)
-    with open(save_path, "w") as f:
-        f.writelines(file_lines)
+    # Stream the body after the header instead of holding the whole file in
+    # memory; writing via a temp file keeps the in-place case safe
+    tmp_path = f"{save_path}.tmp"
+    with open(pdb_path, "rb") as src, open(tmp_path, "wb") as dst:
+        dst.write(header_string.encode())
+        shutil.copyfileobj(src, dst, length=1 << 16)
+    os.replace(tmp_path, save_path)
 
 
 def csv_merge(
@@ -712,7 +893,7 @@ def csv_merge(
     if prefix not in ['esm', 'af2', 'joint']:
         raise ValueError("Prefix must be 'esm', 'af2' or 'joint'!")
 
-    merged_data = pd.DataFrame()
+    frames = []
     log.info(f'Merging evaluation results from {root_dir}......')
     file_count = 0
     for root, dirs, files in os.walk(root_dir, followlinks=True):
@@ -720,11 +901,12 @@ def csv_merge(
             if file == f'{prefix}_eval_results.csv':
                 file_count += 1
                 csv_path = os.path.join(root, file)
-                df = pd.read_csv(csv_path)
+                df = pacsv.read_csv(csv_path).to_pandas() if pacsv is not None else pd.read_csv(csv_path)
 
                 parent_dir = os.path.abspath(os.path.join(root, os.pardir))
                 #print(parent_dir)
-                pdb_files = glob.glob(os.path.join(parent_dir, '*.pdb'))
+                with os.scandir(parent_dir) as entries:
+                    pdb_files = [entry.path for entry in entries if entry.name.endswith('.pdb')]
 
                 # Check if there is more than one .pdb file
                 if len(pdb_files) > 1:
@@ -739,7 +921,11 @@ def csv_merge(
                 elif prefix == 'af2':
                     df['folding_method'] = 'AlphaFold2'
 
-                merged_data = pd.concat([merged_data, df], ignore_index=True)
+                frames.append(df)
+
+    # One concat at the end instead of re-copying the growing frame on
+    # every file
+    merged_data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
     log.info(f'Collected evaluation results from {file_count} protein backbones.')
 
@@ -750,6 +936,12 @@ def analyze_success_rate(merged_data: Union[str, Path, pd.DataFrame], group_mode
     # Define success criteria for each sample
     merged_data = pd.read_csv(merged_data) if isinstance(merged_data, str) or isinstance(merged_data, Path) else merged_data
 
+    # Categorical keys let the factorize/groupby paths below run on integer
+    # codes instead of hashing Python strings row by row
+    for column in ('PDB id', 'backbone_path'):
+        if column in merged_data.columns:
+            merged_data[column] = merged_data[column].astype('category')
+
     #merged_data['backbone_success'] = (merged_data['rmsd'] < 2)
     #merged_data['motif_success'] = (merged_data['motif_rmsd'] < 1)
     merged_data['seq_hit'] = (merged_data['rmsd'] < 2) & (merged_data['motif_rmsd'] < 1)
@@ -757,30 +949,39 @@ def analyze_success_rate(merged_data: Union[str, Path, pd.DataFrame], group_mode
     merged_data['seq_motif_hit'] = (merged_data['motif_rmsd'] < 1)
 
     #merged_data['all_success'] = merged_data['motif_success'] & merged_data['backbone_success']
-    # Group by 'backbone_path' and aggregate the success criteria
-    group_success = merged_data.groupby('backbone_path').agg({
-        'seq_hit': 'any',
-        'seq_backbone_hit': 'any',
-        'seq_motif_hit': 'any'
-    }).rename(columns={
-        'seq_hit': 'Success',
-        'seq_backbone_hit': 'backbone_success',
-        'seq_motif_hit': 'motif_success'
-    })
-
-    # Join the aggregated results back to the original DataFrame
-    merged_data = merged_data.merge(group_success, on='backbone_path', how='left')
+    # Per-backbone "any" aggregation done as flat boolean reductions:
+    # factorize the paths once, then one bitwise_or.reduceat per column over
+    # the group-sorted values and broadcast back with fancy indexing. This
+    # skips pandas' per-group dispatch and the merge round-trip.
+    codes, _ = pd.factorize(merged_data['backbone_path'], sort=False)
+    per_group_any = {}
+    if len(codes):
+        order = np.argsort(codes, kind='stable')
+        codes_sorted = codes[order]
+        edges = np.flatnonzero(np.r_[True, np.diff(codes_sorted) != 0])
+        for column in ('seq_hit', 'seq_backbone_hit', 'seq_motif_hit'):
+            values_sorted = merged_data[column].to_numpy(dtype=np.uint8)[order]
+            per_group_any[column] = np.bitwise_or.reduceat(values_sorted, edges).astype(bool)
+    merged_data['Success'] = per_group_any['seq_hit'][codes] if len(codes) else False
+    merged_data['backbone_success'] = per_group_any['seq_backbone_hit'][codes] if len(codes) else False
+    merged_data['motif_success'] = per_group_any['seq_motif_hit'][codes] if len(codes) else False
+
+    # Build the success mask and the surviving paths once; every consumer
+    # below works from these instead of re-filtering the whole frame
+    success_mask = merged_data['Success'].to_numpy(dtype=bool)
+    success_paths = merged_data['backbone_path'].to_numpy()[success_mask]
 
     successful_backbones = set()
     if group_mode == 'all':
-        success_count = merged_data[merged_data['Success'] == True]['backbone_path'].nunique()
-        successful_backbones = set(merged_data[merged_data['Success'] == True]['backbone_path'])
+        successful_backbones = set(success_paths.tolist())
+        success_count = len(successful_backbones)
     elif group_mode == 'PDB id':
         success_count = dict.fromkeys(merged_data['PDB id'].unique(), 0)
-        success_per_pdb = merged_data[merged_data['Success'] == True].groupby('PDB id')['backbone_path'].nunique()
+        success_per_pdb = pd.Series(success_paths).groupby(
+            merged_data['PDB id'].to_numpy()[success_mask]).nunique()
         success_count.update(success_per_pdb.to_dict())
 
-        successful_backbones = set(merged_data[merged_data['Success'] == True]['backbone_path'])
+        successful_backbones = set(success_paths.tolist())
 
     #print(f'merged_data.columns: {set(merged_data.columns)}')
 
@@ -796,28 +997,19 @@ def format_chain_positions(positions: List[str]) -> str:
     if not positions:
         return ""
 
-    formatted_positions = []
-    current_chain = positions[0][0]
-    start_num = int(positions[0][1:])
-    end_num = start_num
+    # Detect the run boundaries (chain change or non-consecutive residue)
+    # vectorized, then format one string per run instead of stepping through
+    # every position in Python
+    chains = np.array([pos[0] for pos in positions])
+    numbers = np.fromiter((int(pos[1:]) for pos in positions), dtype=np.int64, count=len(positions))
+    breaks = np.flatnonzero(np.r_[True, (chains[1:] != chains[:-1]) | (numbers[1:] != numbers[:-1] + 1)])
+    run_ends = np.r_[breaks[1:] - 1, len(positions) - 1]
 
-    for pos in positions[1:]:
-        chain, num = pos[0], int(pos[1:])
-        if chain == current_chain and num == end_num + 1:
-            end_num = num
-        else:
-            if start_num == end_num:
-                formatted_positions.append(f"{current_chain}{start_num}")
-            else:
-                formatted_positions.append(f"{current_chain}{start_num}-{end_num}")
-            current_chain = chain
-            start_num = end_num = num
-
-    # Append the last range or number
-    if start_num == end_num:
-        formatted_positions.append(f"{current_chain}{start_num}")
-    else:
-        formatted_positions.append(f"{current_chain}{start_num}-{end_num}")
+    formatted_positions = [
+        f"{chains[start]}{numbers[start]}" if numbers[start] == numbers[end]
+        else f"{chains[start]}{numbers[start]}-{numbers[end]}"
+        for start, end in zip(breaks, run_ends)
+    ]
 
     return ";".join(formatted_positions)
 
@@ -831,12 +1023,16 @@ def parse_input_scaffold(
 
     """
     contig = read_contig_from_header(pdb_path)[0] # Example contig
-    if len(contig.split(',')) == 3:
-        pdb_id, motif_spec, redesign_idx = contig.split(',')
-    elif len(contig.split(',')) == 2:
-        pdb_id, motif_spec = contig.split(',')
-        if get_redesign_positions(pdb_path) is not None:
-            redesign_idx = get_redesign_positions(pdb_path)[2]
+    contig_parts = contig.split(',')
+    if len(contig_parts) == 3:
+        pdb_id, motif_spec, redesign_idx = contig_parts
+    elif len(contig_parts) == 2:
+        pdb_id, motif_spec = contig_parts
+        # One lookup instead of parsing the structure for the check and
+        # again for the positions
+        redesign_info = get_redesign_positions(pdb_path)
+        if redesign_info is not None:
+            redesign_idx = redesign_info[2]
     else:
         raise ValueError(f'Incorrect format for contig {contig}! Please check again.')
 
@@ -163,6 +163,28 @@ def calc_aligned_rmsd(pos_1, pos_2):
     return np.mean(np.linalg.norm(aligned_pos_1 - pos_2, axis=-1))
 
 
+def calc_aligned_rmsd_batch(pos_stack_1, pos_stack_2):
+    """calc_aligned_rmsd over stacks of equal-length coordinate pairs.
+
+    numpy broadcasts the Kabsch SVD over the leading axis, so all pairs of
+    one backbone are aligned in a single batched call instead of one
+    Python-level alignment per designed sequence. Returns one value per
+    pair, identical to calling calc_aligned_rmsd pairwise.
+    """
+    A = np.asarray(pos_stack_1, dtype=np.float64)
+    B = np.asarray(pos_stack_2, dtype=np.float64)
+    A_centered = A - A.mean(axis=1, keepdims=True)
+    B_centered = B - B.mean(axis=1, keepdims=True)
+    H = np.einsum('bni,bnj->bij', A_centered, B_centered)
+    U, _, Vt = np.linalg.svd(H)
+    # Branchless reflection fix: flip the last row of Vt where det(R) < 0
+    signs = np.sign(np.linalg.det(Vt.transpose(0, 2, 1) @ U.transpose(0, 2, 1)))
+    Vt[:, 2, :] *= signs[:, None]
+    R = Vt.transpose(0, 2, 1) @ U.transpose(0, 2, 1)
+    diff = A_centered @ R.transpose(0, 2, 1) - B_centered
+    return np.linalg.norm(diff, axis=-1).mean(axis=-1)
+
+
 def rigid_transform_3D(A, B, verbose=False):
     # Transforms A to look like B
     # https://github.com/nghiaho12/rigid_transform_3D
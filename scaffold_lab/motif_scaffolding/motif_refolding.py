@@ -11,6 +11,7 @@ To run ESMFold and AlphaFold2 simultaneously:
 """
 
 import os
+import csv
 import tree
 import time
 import json
@@ -26,9 +27,9 @@ import pandas as pd
 import sys
 import rootutils
 import shutil
-import GPUtil
 from pathlib import Path
 from typing import Optional, Dict, Union, List
+from concurrent.futures import ThreadPoolExecutor
 from omegaconf import DictConfig, OmegaConf
 
 import esm
@@ -91,11 +92,14 @@ class Refolder:
         # Set-up accelerator
         if torch.cuda.is_available():
             if self._infer_conf.gpu_id is None:
-                available_gpus = ''.join(
-                    [str(x) for x in GPUtil.getAvailable(
-                        order="memory", limit = 8)]
-                )
-                self.device = f'cuda:{available_gpus[0]}'
+                # Pick the GPU with the most free memory straight from the
+                # driver; no nvidia-smi subprocess, and double-digit device
+                # ids are handled correctly
+                free_memory = [
+                    (torch.cuda.mem_get_info(gpu_id)[0], gpu_id)
+                    for gpu_id in range(torch.cuda.device_count())
+                ]
+                self.device = f'cuda:{max(free_memory)[1]}'
             else:
                 self.device = f'cuda:{self._infer_conf.gpu_id}'
         else:
@@ -106,6 +110,8 @@ class Refolder:
 
         # Customizing different structure prediction methods
         self._forward_folding = self._infer_conf.predict_method
+        if 'ESMFold' in self._forward_folding:
+            self._esmf_conf = self._infer_conf.esmf
         if 'AlphaFold2' in self._forward_folding:
             self._af2_conf = self._infer_conf.af2
             colabfold_path = self._af2_conf.executive_colabfold_path
@@ -141,14 +147,80 @@ class Refolder:
         elif self.device == 'cpu': # ESMFold is not supported for half-precision model when running on CPU
             self._folding_model = esm.pretrained.esmfold_v1().float().eval()
         self._folding_model = self._folding_model.to(self.device)
+        if 'cuda' in self.device:
+            # Let the FP32 side channels of the trunk run on tensor cores;
+            # scTM / RMSD are insensitive to the TF32 precision difference
+            matmul_precision = self._infer_conf.get('matmul_precision', 'high')
+            torch.set_float32_matmul_precision(matmul_precision)
+            if matmul_precision != 'highest':
+                torch.backends.cuda.matmul.allow_tf32 = True
+                torch.backends.cudnn.allow_tf32 = True
+            if getattr(self, '_esmf_conf', None) is not None and self._esmf_conf.get('esm_quantize', False):
+                try:
+                    import bitsandbytes as bnb
+                    self._quantize_esm_trunk(bnb)
+                except ImportError:
+                    self._log.warning(
+                        'bitsandbytes is not installed; keeping the ESM trunk in half precision.')
+            if getattr(self, '_esmf_conf', None) is not None and self._esmf_conf.get('compile', False):
+                # dynamic=True because sequence length varies per batch; the
+                # length-sorted batching keeps the set of specializations small
+                try:
+                    self._folding_model = torch.compile(
+                        self._folding_model, mode='reduce-overhead', fullgraph=False, dynamic=True)
+                    self._log.info('Compiled ESMFold with torch.compile.')
+                except Exception as e:
+                    self._log.warning(f'torch.compile failed ({e}); running ESMFold eagerly.')
+
+
+    def _quantize_esm_trunk(self, bnb):
+        """Swap the linear layers of the ESM2 trunk for int8 ones.
+
+        The language model holds most of ESMFold's parameters and is
+        memory-bandwidth-bound at the batch sizes used here, so weight-only
+        int8 roughly halves the bytes streamed per forward pass. The folding
+        trunk and structure module stay in half precision.
+        """
+        import torch.nn as nn
+
+        def _swap(module):
+            for name, child in module.named_children():
+                if isinstance(child, nn.Linear):
+                    quantized = bnb.nn.Linear8bitLt(
+                        child.in_features,
+                        child.out_features,
+                        bias=child.bias is not None,
+                        has_fp16_weights=False,
+                    )
+                    quantized.load_state_dict(child.state_dict())
+                    setattr(module, name, quantized.to(self.device))
+                else:
+                    _swap(child)
 
+        _swap(self._folding_model.esm)
+        self._log.info('Quantized the ESM2 trunk to int8 (weight-only).')
 
     def run_sampling(self):
         
         # Run ProteinMPNN
         motif_info_dict = {}
+        refold_jobs = []
+
+        def _link_or_copy(src, dst):
+            # Hard links make the staging "copies" free; fall back to a real
+            # copy when the dirs live on different filesystems
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copy(src, dst)
 
-        for pdb_file in os.listdir(self._sample_dir):
+        # One directory listing up front replaces a stat call per backbone
+        with os.scandir(self._output_dir) as entries:
+            existing_backbone_dirs = {entry.name for entry in entries if entry.is_dir()}
+        with os.scandir(self._sample_dir) as entries:
+            pdb_files = sorted(entry.name for entry in entries)
+
+        for pdb_file in pdb_files:
             if ".pdb" in pdb_file:
                 backbone_name = os.path.splitext(pdb_file)[0]
                 sample_num = backbone_name.split("_")[-1]
@@ -215,73 +287,80 @@ class Refolder:
                 reference_motif = au.motif_extract(reference_contig, reference_pdb, atom_part="backbone")
 
                 # Save outputs
-                backbone_dir = os.path.join(self._output_dir, f'{backbone_name}_{sample_num}')
-                if os.path.exists(backbone_dir):
+                if f'{backbone_name}_{sample_num}' in existing_backbone_dirs:
                     self._log.info(f'Backbone {backbone_name} already existed, pass then.')
                     continue
+                backbone_dir = os.path.join(self._output_dir, f'{backbone_name}_{sample_num}')
 
                 os.makedirs(backbone_dir, exist_ok=True)
                 self._log.info(f'Running self-consistency on {backbone_name}')
-                shutil.copy2(os.path.join(self._sample_dir, pdb_file), backbone_dir)
+                _link_or_copy(os.path.join(self._sample_dir, pdb_file),
+                              os.path.join(backbone_dir, pdb_file))
                 print(f'copied {pdb_file} to {backbone_dir}')
 
                 #separate_pdb_folder = os.path.join(backbone_dir, backbone_name)
                 pdb_path = os.path.join(backbone_dir, pdb_file)
                 sc_output_dir = os.path.join(backbone_dir, 'self_consistency')
                 os.makedirs(sc_output_dir, exist_ok=True)
-                shutil.copy(pdb_path, os.path.join(
+                _link_or_copy(pdb_path, os.path.join(
                     sc_output_dir, os.path.basename(pdb_path)))
 
 
                 if backbone_name == '6VW1':
-                    _ = self.run_self_consistency(
-                    sc_output_dir,
-                    pdb_path,
-                    motif_mask=mask,
-                    motif_indices=motif_indices,
-                    rms=rms,
-                    complex_motif=chain_B_indices
-                )
+                    refold_jobs.append(dict(
+                        decoy_pdb_dir=sc_output_dir,
+                        reference_pdb_path=pdb_path,
+                        motif_mask=mask,
+                        motif_indices=motif_indices,
+                        rms=rms,
+                        complex_motif=chain_B_indices
+                    ))
                 else:
-                    _ = self.run_self_consistency(
-                        sc_output_dir,
-                        pdb_path,
+                    refold_jobs.append(dict(
+                        decoy_pdb_dir=sc_output_dir,
+                        reference_pdb_path=pdb_path,
                         motif_mask=mask,
                         motif_indices=motif_indices,
                         rms=rms,
                         ref_motif=reference_motif,
                         sample_contig=design_contig
-                    )
-                self._log.info(f'Done sample: {pdb_path}')
+                    ))
+
+        # ProteinMPNN runs as subprocesses that release the GIL, so a small
+        # thread pool lets sequence design of the next backbones proceed
+        # while this thread folds the current one on the GPU
+        with ThreadPoolExecutor(max_workers=self._infer_conf.get('pmpnn_workers', 2)) as executor:
+            fasta_futures = [
+                executor.submit(
+                    self.run_proteinmpnn,
+                    job['decoy_pdb_dir'],
+                    job['reference_pdb_path'],
+                    motif_indices=job.get('motif_indices'),
+                    complex_motif=job.get('complex_motif'),
+                )
+                for job in refold_jobs
+            ]
+            for job, fasta_future in zip(refold_jobs, fasta_futures):
+                _ = self.run_self_consistency(**job, mpnn_fasta_path=fasta_future.result())
+                self._log.info(f'Done sample: {job["reference_pdb_path"]}')
         output_json_path = os.path.join(self._output_dir, 'motif_info.json')
         with open(output_json_path, 'w') as json_file:
             json.dump(motif_info_dict, json_file, indent=4, separators=(",", ": "), sort_keys=True)
         self._log.info(f'Motif information saved into {output_json_path}')
 
-    def run_self_consistency(
+    def run_proteinmpnn(
             self,
             decoy_pdb_dir: str,
             reference_pdb_path: str,
-            motif_mask: Optional[np.ndarray]=None,
             motif_indices: Optional[Union[List, str]]=None,
-            rms: Optional[float]=None,
             complex_motif: Optional[List]=None,
-            ref_motif=None,
-            sample_contig=None
-            ):
-        """Run self-consistency on design proteins against reference protein.
-
-        Args:
-            decoy_pdb_dir: directory where designed protein files are stored.
-            reference_pdb_path: path to reference protein file
-            motif_mask: Optional mask of which residues are the motif.
+            ) -> str:
+        """Run ProteinMPNN on one backbone and return the output fasta path.
 
-        Returns:
-            Writes ProteinMPNN outputs to decoy_pdb_dir/seqs
-            Writes ESMFold outputs to decoy_pdb_dir/esmf
-            Writes results in decoy_pdb_dir/sc_results.csv
+        Split out of run_self_consistency so the subprocess-bound sequence
+        design of one backbone can run concurrently with GPU folding of
+        another (see run_sampling).
         """
-
         # Check whether given backbones are CA-only
         file_to_be_checked = os.path.join(
             decoy_pdb_dir,
@@ -304,7 +383,7 @@ class Refolder:
 
         jsonl_path = os.path.join(decoy_pdb_dir, "parsed_pdbs.jsonl")
         process = subprocess.Popen([
-            'python',
+            sys.executable,
             f'{self._pmpnn_dir}/helper_scripts/parse_multiple_chains.py',
             f'--input_path={decoy_pdb_dir}',
             f'--output_path={jsonl_path}',
@@ -356,7 +435,7 @@ class Refolder:
 
 
             subprocess.call([
-                'python',
+                sys.executable,
                 os.path.join(self._pmpnn_dir, 'helper_scripts/make_fixed_positions_dict.py'),
                 '--input_path', jsonl_path,
                 '--output_path', path_for_fixed_positions,
@@ -386,7 +465,6 @@ class Refolder:
             except Exception as e:
                 num_tries += 1
                 self._log.info(f'Failed ProteinMPNN. Attempt {num_tries}/5')
-                torch.cuda.empty_cache()
                 if num_tries > 4:
                     raise e
         mpnn_fasta_path = os.path.join(
@@ -394,45 +472,74 @@ class Refolder:
             'seqs',
             os.path.basename(reference_pdb_path).replace('.pdb', '.fa')
         )
+        return mpnn_fasta_path
+
+    def run_self_consistency(
+            self,
+            decoy_pdb_dir: str,
+            reference_pdb_path: str,
+            motif_mask: Optional[np.ndarray]=None,
+            motif_indices: Optional[Union[List, str]]=None,
+            rms: Optional[float]=None,
+            complex_motif: Optional[List]=None,
+            ref_motif=None,
+            sample_contig=None,
+            mpnn_fasta_path: Optional[str]=None
+            ):
+        """Run self-consistency on design proteins against reference protein.
+
+        Args:
+            decoy_pdb_dir: directory where designed protein files are stored.
+            reference_pdb_path: path to reference protein file
+            motif_mask: Optional mask of which residues are the motif.
+
+        Returns:
+            Writes ProteinMPNN outputs to decoy_pdb_dir/seqs
+            Writes ESMFold outputs to decoy_pdb_dir/esmf
+            Writes results in decoy_pdb_dir/sc_results.csv
+        """
+
+        if mpnn_fasta_path is None:
+            mpnn_fasta_path = self.run_proteinmpnn(
+                decoy_pdb_dir,
+                reference_pdb_path,
+                motif_indices=motif_indices,
+                complex_motif=complex_motif,
+            )
 
         # Run ESMFold on each ProteinMPNN sequence and calculate metrics.
-        mpnn_results = {
-            'tm_score': [],
-            'sample_path': [],
-            'header': [],
-            'sequence': [],
-            'rmsd': [],
-            'pae': [],
-            'ptm': [],
-            'plddt': [],
-            'length': [],
-            'backbone_motif_rmsd': [],
-            'motif_rmsd': [],
-            'mpnn_score': [],
-            'sample_idx': []
-        }
+        # One metrics dict per sequence, streamed through csv.DictWriter
+        # below instead of being realized as a DataFrame first
+        mpnn_fields = [
+            'tm_score', 'sample_path', 'header', 'sequence', 'rmsd', 'pae',
+            'ptm', 'plddt', 'length', 'backbone_motif_rmsd', 'motif_rmsd',
+            'mpnn_score', 'sample_idx'
+        ]
         if motif_mask is not None:
             # Only calculate motif RMSD if mask is specified.
-            mpnn_results['refold_motif_rmsd'] = []
+            mpnn_fields.append('refold_motif_rmsd')
+        mpnn_rows = []
         esmf_dir = os.path.join(decoy_pdb_dir, 'esmf')
         af2_raw_dir = os.path.join(decoy_pdb_dir, 'af2_raw_outputs')
         fasta_seqs = fasta.FastaFile.read(mpnn_fasta_path)
         filtered_seqs = {header: seq for header, seq in fasta_seqs.items() if header.startswith("T=0")} # Drop original sequence
         if self._sample_conf.sort_by_score:
         # Only take seqs with lowerst global score to enter refolding
-            scores = []
-            for i, (header, string) in enumerate(filtered_seqs.items()):
-                #if i == 0:
-                #    global_score = float(header.split(", ")[2].split("=")[1])
-                #    original_seq = (global_score, header, string)
-                #else:
-                global_score = float(header.split(", ")[3].split("=")[1])
-                scores.append((global_score, header, string))
-            scores.sort(key=lambda x: x[0])
-
-            top_seqs_list = scores[:self._sample_conf.seq_per_sample]
-            #top_seqs_list.insert(0, original_seq) # Include the original seq
-            top_seqs = {header: seq for _, header, seq in top_seqs_list}
+            # O(N) partial selection of the K lowest global scores; only the
+            # K survivors get sorted instead of the whole candidate list
+            seq_items = list(filtered_seqs.items())
+            global_scores = np.fromiter(
+                (float(header.split(", ")[3].split("=")[1]) for header, _ in seq_items),
+                dtype=np.float64,
+                count=len(seq_items),
+            )
+            top_k = min(self._sample_conf.seq_per_sample, len(seq_items))
+            if top_k:
+                top_idx = np.argpartition(global_scores, top_k - 1)[:top_k]
+                top_idx = top_idx[np.argsort(global_scores[top_idx], kind='stable')]
+            else:
+                top_idx = []
+            top_seqs = {seq_items[i][0]: seq_items[i][1] for i in top_idx}
 
             top_seqs_path = os.path.join(
                 decoy_pdb_dir,
@@ -451,67 +558,123 @@ class Refolder:
 
 
         sample_feats = su.parse_pdb_feats('sample', reference_pdb_path)
+        # The reference sequence is the same for every sample; derive it once
+        sample_seq = su.aatype_to_seq(sample_feats['aatype'])
+
+        # Parse ProteinMPNN headers once: both folding backends need the same
+        # sample index and score, so neither loop re-splits the header strings
+        seq_records = []
+        for header, string in seqs_dict.items():
+            if header.startswith("T=0"):
+                idx = header.split('sample=')[1].split(',')[0]
+                score = float(header.split(", ")[3].split("=")[1])
+            else:
+                idx = 0
+                score = float(header.split(", ")[2].split("=")[1])
+            seq_records.append((header, string, idx, score))
 
         if 'ESMFold' in self._forward_folding:
             os.makedirs(esmf_dir, exist_ok=True)
-            for i, (header, string) in enumerate(seqs_dict.items()):
 
-                # Get score for ProteinMPNN
-                if header.startswith("T=0"):
-                    idx = header.split('sample=')[1].split(',')[0]
-                    score = float(header.split(", ")[3].split("=")[1])
-                else:
-                    idx = 0
-                    score = float(header.split(", ")[2].split("=")[1])
             # Run ESMFold
-                self._log.info(f'Running ESMFold......')
-                esmf_sample_path = os.path.join(esmf_dir, f'sample_{idx}.pdb')
-                _, full_output = self.run_folding(string, esmf_sample_path)
-                esmf_feats = su.parse_pdb_feats('folded_sample', esmf_sample_path)
-                sample_seq = su.aatype_to_seq(sample_feats['aatype'])
+            self._log.info(f'Running ESMFold......')
+            # Length-sorted batches keep padding waste low inside each batch
+            seq_records.sort(key=lambda record: len(record[1]))
+            esmf_batch_size = self._esmf_conf.batch_size
+            folded_outputs = {}
+            # PDB serialization is pure CPU work; running it on a small
+            # thread pool overlaps it with the next batch's forward pass
+            pdb_futures = []
+            with ThreadPoolExecutor(max_workers=2) as pdb_executor:
+                for start in range(0, len(seq_records), esmf_batch_size):
+                    batch = seq_records[start:start + esmf_batch_size]
+                    batch_paths = [os.path.join(esmf_dir, f'sample_{idx}.pdb') for _, _, idx, _ in batch]
+                    pdb_future, full_output = self.run_folding(
+                        [string for _, string, _, _ in batch], batch_paths,
+                        executor=pdb_executor)
+                    pdb_futures.append(pdb_future)
+                    for j, (_, string, idx, _) in enumerate(batch):
+                        # Per-sample scalars; the pae mean must ignore the padded tail
+                        length = len(string)
+                        folded_outputs[idx] = {
+                            'sample_path': batch_paths[j],
+                            'pae': torch.mean(full_output['predicted_aligned_error'][j, :length, :length]).item(),
+                            'ptm': full_output['ptm'][j].item(),
+                            'plddt': full_output['mean_plddt'][j].item(),
+                            # CA coordinates (atom14 index 1) straight from the
+                            # model output: the scTM/RMSD metrics below then skip
+                            # re-parsing the PDB file that was just written
+                            'ca_positions': full_output['positions'][-1, j, :length, 1, :].float().numpy(),
+                        }
+
+                # Every PDB must be on disk before motif extraction below
+                # reads it; .result() also re-raises any write error
+                for pdb_future in pdb_futures:
+                    _ = pdb_future.result()
+
+            # All samples of one backbone share the same length, so their
+            # backbone stacks can be aligned with one batched Kabsch call
+            # instead of one SVD per sequence. Both Kabsch and tm_align
+            # superpose internally, so the raw (uncentered) model coordinates
+            # are equivalent to the centered ones a PDB reparse would yield.
+            if seq_records:
+                pred_stack = np.stack(
+                    [folded_outputs[idx]['ca_positions'] for _, _, idx, _ in seq_records])
+                sample_stack = np.broadcast_to(
+                    sample_feats['bb_positions'], pred_stack.shape)
+                rmsds = su.calc_aligned_rmsd_batch(sample_stack, pred_stack)
+                if motif_mask is not None:
+                    refold_motif_rmsds = su.calc_aligned_rmsd_batch(
+                        sample_stack[:, motif_mask], pred_stack[:, motif_mask])
+
+            for k, (header, string, idx, score) in enumerate(seq_records):
+                esmf_sample_path = folded_outputs[idx]['sample_path']
 
                 esm_predict_motif = au.motif_extract(sample_contig, esmf_sample_path, atom_part="backbone")
                 motif_rmsd = au.rmsd(ref_motif, esm_predict_motif)
-                mpnn_results['motif_rmsd'].append(f'{motif_rmsd:.3f}')
                 # Calculate scTM of ESMFold outputs with reference protein
                 _, tm_score = su.calc_tm_score(
-                    sample_feats['bb_positions'], esmf_feats['bb_positions'],
+                    sample_feats['bb_positions'], pred_stack[k],
                     sample_seq, sample_seq)
-                rmsd = su.calc_aligned_rmsd(
-                    sample_feats['bb_positions'], esmf_feats['bb_positions'])
-                pae = torch.mean(full_output['predicted_aligned_error']).item()
-                ptm = full_output['ptm'].item()
-                plddt = full_output['mean_plddt'].item()
+                row = {
+                    'tm_score': f'{tm_score:.3f}',
+                    'sample_path': os.path.abspath(esmf_sample_path),
+                    'header': header,
+                    'sequence': string,
+                    'rmsd': f'{rmsds[k]:.3f}',
+                    'pae': f"{folded_outputs[idx]['pae']:.3f}",
+                    'ptm': f"{folded_outputs[idx]['ptm']:.3f}",
+                    'plddt': f"{folded_outputs[idx]['plddt']:.3f}",
+                    'length': len(string),
+                    'motif_rmsd': f'{motif_rmsd:.3f}',
+                    'mpnn_score': f'{score:.3f}',
+                    'sample_idx': int(idx),
+                }
                 if motif_mask is not None:
-                    sample_motif = sample_feats['bb_positions'][motif_mask]
-                    esm_motif = esmf_feats['bb_positions'][motif_mask]
-                    refold_motif_rmsd = su.calc_aligned_rmsd(
-                        sample_motif, esm_motif)
-                    mpnn_results['refold_motif_rmsd'].append(f'{refold_motif_rmsd:.3f}')
+                    row['refold_motif_rmsd'] = f'{refold_motif_rmsds[k]:.3f}'
                 if rms is not None:
-                    mpnn_results['backbone_motif_rmsd'].append(f'{rms:.3f}')
-                mpnn_results['sample_idx'].append(int(idx))
-                mpnn_results['rmsd'].append(f'{rmsd:.3f}')
-                mpnn_results['tm_score'].append(f'{tm_score:.3f}')
-                mpnn_results['sample_path'].append(os.path.abspath(esmf_sample_path))
-                mpnn_results['header'].append(header)
-                mpnn_results['sequence'].append(string)
-                mpnn_results['pae'].append(f'{pae:.3f}')
-                mpnn_results['ptm'].append(f'{ptm:.3f}')
-                mpnn_results['plddt'].append(f'{plddt:.3f}')
-                mpnn_results['length'].append(len(string))
-                mpnn_results['mpnn_score'].append(f'{score:.3f}')
+                    row['backbone_motif_rmsd'] = f'{rms:.3f}'
+                mpnn_rows.append(row)
 
             # Save results to CSV
+            if rms is None:
+                mpnn_fields.remove('backbone_motif_rmsd')
+            mpnn_rows.sort(key=lambda row: row['sample_idx'])
             esm_csv_path = os.path.join(decoy_pdb_dir, 'esm_eval_results.csv')
-            mpnn_results = pd.DataFrame(mpnn_results)
-            mpnn_results.sort_values('sample_idx', inplace=True)
-            mpnn_results.to_csv(esm_csv_path, index=False)
+            with open(esm_csv_path, 'w', newline='') as csv_file:
+                writer = csv.DictWriter(csv_file, fieldnames=mpnn_fields)
+                writer.writeheader()
+                writer.writerows(mpnn_rows)
 
         # Run AF2
         if 'AlphaFold2' in self._forward_folding:
             self._log.info(f'Running AlphaFold2......')
 
+            # Trim the caching allocator once before handing the GPU to the
+            # AF2 subprocess; doing this inside every retry handler forced a
+            # device sync and pushed later allocations back to cudaMalloc
+            if 'cuda' in self.device and torch.cuda.memory_reserved() > (1 << 30):
+                torch.cuda.empty_cache()
             _ = self.run_af2(seqs_to_refold, af2_raw_dir)
             af2_dir = os.path.join(decoy_pdb_dir, 'af2')
             os.makedirs(af2_dir, exist_ok=True)
@@ -520,18 +683,9 @@ class Refolder:
                 os.path.join(decoy_pdb_dir, 'af2')
             )
 
-            for i, (header, string) in enumerate(seqs_dict.items()):
-                # Find index and score
-                if header.startswith("T=0"):
-                    idx = header.split('sample=')[1].split(',')[0]
-                    score = float(header.split(", ")[3].split("=")[1])
-                else:
-                    idx = 0
-                    score = float(header.split(", ")[2].split("=")[1])
-
+            for header, string, idx, score in seq_records:
                 af2_sample_path = os.path.join(af2_dir, f'sample_{idx}.pdb')
                 af2_feats = su.parse_pdb_feats('folded_sample', af2_sample_path)
-                sample_seq = su.aatype_to_seq(sample_feats['aatype'])
 
                 af2_predict_motif = au.motif_extract(sample_contig, af2_sample_path, atom_part="backbone")
                 motif_rmsd = au.rmsd(ref_motif, af2_predict_motif)
@@ -569,27 +723,54 @@ class Refolder:
             af2_df.to_csv(af2_csv_path, index=False)
 
         if 'ESMFold' in self._forward_folding and 'AlphaFold2' in self._forward_folding:
-            esm_results = pd.read_csv(esm_csv_path)
-            af2_results = pd.read_csv(af2_csv_path)
+            # Both result sets are still in memory; no need to re-parse the
+            # two CSVs that were just written
+            esm_results = pd.DataFrame(mpnn_rows, columns=mpnn_fields)
             esm_results['folding_method'] = 'ESMFold'
-            af2_results['folding_method'] = 'AlphaFold2'
+            af2_results = af2_df.assign(folding_method='AlphaFold2')
             joint_results = pd.concat([esm_results, af2_results], ignore_index=True)
             joint_results.to_csv(os.path.join(decoy_pdb_dir, 'joint_eval_results.csv'), index=False)
 
 
 
-    def run_folding(self, sequence, save_path):
+    def run_folding(self, sequences, save_paths, executor=None):
         """
-        Run ESMFold on sequence.
+        Run ESMFold on a batch of sequences.
+        Single strings / paths are accepted for backwards compatibility.
+        When an executor is given, PDB serialization and writing run on it
+        and a future replaces the pdb string list in the return value, so
+        the caller can overlap them with the next forward pass.
         TBD: Add options for OmegaFold and AlphaFold2.
         """
-        with torch.no_grad():
-            output = self._folding_model.infer(sequence)
-            output_dict = {key: value.cpu() for key, value in output.items()}
-            output = self._folding_model.output_to_pdb(output)
-        with open(save_path, "w") as f:
-            f.write(output[0])
-        return output, output_dict
+        if isinstance(sequences, str):
+            sequences = [sequences]
+        if isinstance(save_paths, (str, Path)):
+            save_paths = [save_paths]
+        # Only the tensors consumed downstream leave the GPU: the metric
+        # scalars/coordinates plus the per-residue fields output_to_pdb
+        # indexes. The large intermediates (pair representation,
+        # distogram/LM logits, frames) stay on-device and are freed
+        # together with `output`
+        needed_keys = (
+            'positions', 'predicted_aligned_error', 'ptm', 'mean_plddt',
+            'aatype', 'atom37_atom_exists', 'residx_atom37_to_atom14',
+            'residue_index', 'plddt', 'chain_index',
+        )
+        with torch.inference_mode():
+            output = self._folding_model.infer(sequences)
+            output_dict = {key: output[key].cpu() for key in needed_keys if key in output}
+
+        def _serialize():
+            # Pure CPU work on the host copies; safe to run off-thread
+            pdb_strings = self._folding_model.output_to_pdb(output_dict)
+            for save_path, pdb_string in zip(save_paths, pdb_strings):
+                with open(save_path, "w") as f:
+                    f.write(pdb_string)
+            return pdb_strings
+
+        if executor is not None:
+            return executor.submit(_serialize), output_dict
+        return _serialize(), output_dict
 
     def run_af2(self, sequence, save_path):
         """
@@ -640,7 +821,6 @@ class Refolder:
             except Exception as e:
                 num_tries_af2 += 1
                 self._log.info(f'Hmm...Maybe some error occurs during executing AlphaFold2. Tried {num_tries_af2}/5')
-                torch.cuda.empty_cache()
                 if num_tries_af2 > 10:
                     raise e
 
@@ -754,7 +934,6 @@ class Evaluator:
                 input_csv=success_results,
                 foldseek_database_path=self._eval_conf.foldseek_database,
                 max_workers=self._num_cpu_cores,
-                cpu_threshold=75.0
             )
             mean_novelty = results_with_novelty['pdbTM'].mean()
             max_novelty = results_with_novelty['pdbTM'].min()
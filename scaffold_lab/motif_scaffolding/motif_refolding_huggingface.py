@@ -767,7 +767,6 @@ class Evaluator:
                 input_csv=success_results,
                 foldseek_database_path=self._eval_conf.foldseek_database,
                 max_workers=self._num_cpu_cores,
-                cpu_threshold=75.0
             )
             mean_novelty = results_with_novelty['pdbTM'].mean()
             max_novelty = results_with_novelty['pdbTM'].min()
@@ -11,6 +11,7 @@ To run ESMFold and AlphaFold2 simultaneously:
 """
 
 import os
+import re
 import tree
 import time
 import numpy as np
@@ -22,9 +23,9 @@ import pandas as pd
 import sys
 import rootutils
 import shutil
-import GPUtil
 from pathlib import Path
 from typing import Optional, Dict, List, Union
+from concurrent.futures import ThreadPoolExecutor
 from omegaconf import DictConfig, OmegaConf
 
 import esm
@@ -43,6 +44,15 @@ rootutils.set_root(
 from analysis import utils as au
 from data import structure_utils as su
 
+# ProteinMPNN writes global_score at a different field position for the
+# original sequence than for sampled ones; matching the key by name keeps
+# score parsing immune to that and to future header layout drift
+_GLOBAL_SCORE_RE = re.compile(r'global_score=([0-9.]+)')
+
+# One loaded ESMFold per device within this process: repeated Refolder
+# constructions (e.g. a hydra multirun) skip the multi-GB weight load
+_ESMFOLD_CACHE = {}
+
 
 class Refolder:
 
@@ -82,11 +92,14 @@ class Refolder:
         # Set-up accelerator
         if torch.cuda.is_available():
             if self._infer_conf.gpu_id is None:
-                available_gpus = ''.join(
-                    [str(x) for x in GPUtil.getAvailable(
-                        order="memory", limit = 8)]
-                )
-                self.device = f'cuda:{available_gpus[0]}'
+                # Pick the GPU with the most free memory straight from the
+                # driver; no nvidia-smi subprocess, and double-digit device
+                # ids are handled correctly
+                free_memory = [
+                    (torch.cuda.mem_get_info(gpu_id)[0], gpu_id)
+                    for gpu_id in range(torch.cuda.device_count())
+                ]
+                self.device = f'cuda:{max(free_memory)[1]}'
             else:
                 self.device = f'cuda:{self._infer_conf.gpu_id}'
         else:
@@ -95,6 +108,8 @@ class Refolder:
 
         # Customizing different structure prediction methods 
         self._forward_folding = self._infer_conf.predict_method
+        if 'ESMFold' in self._forward_folding:
+            self._esmf_conf = self._infer_conf.esmf
         if 'AlphaFold2' in self._forward_folding:
             self._af2_conf = self._infer_conf.af2
             colabfold_path = self._af2_conf.executive_colabfold_path
@@ -122,69 +137,113 @@ class Refolder:
         self._log.info(f'Saving self-consistency config to {config_path}')
         
         # Load models and experiment
+        self._folding_model = _ESMFOLD_CACHE.get(self.device)
+        if self._folding_model is None:
+            if 'cuda' in self.device:
+                self._folding_model = esm.pretrained.esmfold_v1().eval()
+            elif self.device == 'cpu': # ESMFold is not supported for half-precision model when running on CPU
+                self._folding_model = esm.pretrained.esmfold_v1().float().eval()
+            self._folding_model = self._folding_model.to(self.device)
+            _ESMFOLD_CACHE[self.device] = self._folding_model
+        if getattr(self, '_esmf_conf', None) is not None:
+            chunk_size = self._esmf_conf.get('chunk_size', None)
+            if chunk_size is not None:
+                # Tile the trunk's axial/triangle attention: peak activation
+                # memory scales with chunk_size/L, which permits larger batch
+                # sizes on long backbones at a small speed cost
+                self._folding_model.set_chunk_size(int(chunk_size))
         if 'cuda' in self.device:
-            self._folding_model = esm.pretrained.esmfold_v1().eval()
-        elif self.device == 'cpu': # ESMFold is not supported for half-precision model when running on CPU
-            self._folding_model = esm.pretrained.esmfold_v1().float().eval()
-        self._folding_model = self._folding_model.to(self.device)
+            # Let the FP32 side channels of the trunk run on tensor cores;
+            # scTM / RMSD are insensitive to the TF32 precision difference
+            matmul_precision = self._infer_conf.get('matmul_precision', 'high')
+            torch.set_float32_matmul_precision(matmul_precision)
+            if matmul_precision != 'highest':
+                torch.backends.cuda.matmul.allow_tf32 = True
+                torch.backends.cudnn.allow_tf32 = True
+            if getattr(self, '_esmf_conf', None) is not None and self._esmf_conf.get('compile', False):
+                # dynamic=True because sequence length varies per batch
+                try:
+                    self._folding_model = torch.compile(
+                        self._folding_model, mode='reduce-overhead', fullgraph=False, dynamic=True)
+                    self._log.info('Compiled ESMFold with torch.compile.')
+                except Exception as e:
+                    self._log.warning(f'torch.compile failed ({e}); running ESMFold eagerly.')
     
     def run_sampling(self):
         
         # Run ProteinMPNN
+        refold_jobs = []
 
-        for pdb_file in os.listdir(self._sample_dir):
+        def _link_or_copy(src, dst):
+            # Hard links make the staging "copies" free; fall back to a real
+            # copy when the dirs live on different filesystems
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copy(src, dst)
+
+        print(f'sample_dir: {self._sample_dir}')
+        basename_dir = os.path.basename(os.path.normpath(self._sample_dir))
+        # One directory listing up front replaces a stat call per backbone
+        completed_root = os.path.join(self._output_dir, basename_dir)
+        if os.path.isdir(completed_root):
+            with os.scandir(completed_root) as entries:
+                existing_backbone_dirs = {entry.name for entry in entries if entry.is_dir()}
+        else:
+            existing_backbone_dirs = set()
+        with os.scandir(self._sample_dir) as entries:
+            pdb_files = sorted(entry.name for entry in entries if entry.name.endswith('.pdb'))
+
+        for pdb_file in pdb_files:
             backbone_name = os.path.splitext(pdb_file)[0]
-            print(f'sample_dir: {self._sample_dir}')
-            basename_dir = os.path.basename(os.path.normpath(self._sample_dir))
-            backbone_dir = os.path.join(self._output_dir, basename_dir, f'{backbone_name}')
-            if os.path.exists(backbone_dir):
+            if backbone_name in existing_backbone_dirs:
                 self._log.info(f'Backbone {backbone_name} already existed, pass then.')
                 continue
+            backbone_dir = os.path.join(completed_root, f'{backbone_name}')
             
             os.makedirs(backbone_dir, exist_ok=True)
             self._log.info(f'Running self-consistency on {backbone_name}')
             print(f'pdb_file:{pdb_file}')
             print(f'backbone_dir:{backbone_dir}')
-            shutil.copy2(os.path.join(self._sample_dir, pdb_file), backbone_dir)
+            _link_or_copy(os.path.join(self._sample_dir, pdb_file),
+                          os.path.join(backbone_dir, pdb_file))
             self._log.info(f'copied {pdb_file} to {backbone_dir}')
             
             #seperate_pdb_folder = os.path.join(backbone_dir, backbone_name)
             pdb_path = os.path.join(backbone_dir, pdb_file)
             sc_output_dir = os.path.join(backbone_dir, 'self_consistency')
             os.makedirs(sc_output_dir, exist_ok=True)
-            shutil.copy(pdb_path, os.path.join(
+            _link_or_copy(pdb_path, os.path.join(
                 sc_output_dir, os.path.basename(pdb_path)))
 
-            _ = self.run_self_consistency(
-                sc_output_dir,
-                pdb_path,
-                motif_mask=None
-            )
-            self._log.info(f'Done sample: {pdb_path}')
-    
-    def run_self_consistency(
+            refold_jobs.append((sc_output_dir, pdb_path))
+
+        # ProteinMPNN runs as subprocesses that release the GIL, so a small
+        # thread pool lets sequence design of the next backbones proceed
+        # while this thread folds the current one on the GPU
+        with ThreadPoolExecutor(max_workers=self._infer_conf.get('pmpnn_workers', 2)) as executor:
+            fasta_futures = [
+                executor.submit(self.run_proteinmpnn, sc_output_dir, pdb_path)
+                for sc_output_dir, pdb_path in refold_jobs
+            ]
+            for (sc_output_dir, pdb_path), fasta_future in zip(refold_jobs, fasta_futures):
+                _ = self.run_self_consistency(
+                    sc_output_dir,
+                    pdb_path,
+                    motif_mask=None,
+                    mpnn_fasta_path=fasta_future.result()
+                )
+                self._log.info(f'Done sample: {pdb_path}')
+
+    def run_proteinmpnn(
             self,
             decoy_pdb_dir: str,
-            reference_pdb_path: str,
-            motif_mask: Optional[np.ndarray]=None):
-        """Run self-consistency on design proteins against reference protein.
-        
-        Args:
-            decoy_pdb_dir: directory where designed protein files are stored.
-            reference_pdb_path: path to reference protein file
-            motif_mask: Optional mask of which residues are the motif.
+            reference_pdb_path: str) -> str:
+        """Run ProteinMPNN on one backbone and return the fasta it writes."""
 
-        Returns:
-            Writes ProteinMPNN outputs to decoy_pdb_dir/seqs
-            Writes ESMFold outputs to decoy_pdb_dir/esmf
-            Writes results in decoy_pdb_dir/sc_results.csv
-        """
-
-        # Run ProteinMPNN
-        
         jsonl_path = os.path.join(decoy_pdb_dir, "parsed_pdbs.jsonl")
         process = subprocess.Popen([
-            'python',
+            sys.executable,
             f'{self._pmpnn_dir}/helper_scripts/parse_multiple_chains.py',
             f'--input_path={decoy_pdb_dir}',
             f'--output_path={jsonl_path}',
@@ -226,7 +285,6 @@ class Refolder:
             except Exception as e:
                 num_tries += 1
                 self._log.info(f'Failed ProteinMPNN. Attempt {num_tries}/5')
-                torch.cuda.empty_cache()
                 if num_tries > 4:
                     raise e
         mpnn_fasta_path = os.path.join(
@@ -234,6 +292,31 @@ class Refolder:
             'seqs',
             os.path.basename(reference_pdb_path).replace('.pdb', '.fa')
         )
+        return mpnn_fasta_path
+
+    def run_self_consistency(
+            self,
+            decoy_pdb_dir: str,
+            reference_pdb_path: str,
+            motif_mask: Optional[np.ndarray]=None,
+            mpnn_fasta_path: Optional[str]=None):
+        """Run self-consistency on design proteins against reference protein.
+        
+        Args:
+            decoy_pdb_dir: directory where designed protein files are stored.
+            reference_pdb_path: path to reference protein file
+            motif_mask: Optional mask of which residues are the motif.
+            mpnn_fasta_path: fasta of designed sequences; generated with
+                ProteinMPNN here when not supplied by the caller.
+
+        Returns:
+            Writes ProteinMPNN outputs to decoy_pdb_dir/seqs
+            Writes ESMFold outputs to decoy_pdb_dir/esmf
+            Writes results in decoy_pdb_dir/sc_results.csv
+        """
+
+        if mpnn_fasta_path is None:
+            mpnn_fasta_path = self.run_proteinmpnn(decoy_pdb_dir, reference_pdb_path)
 
         # Run ESMFold on each ProteinMPNN sequence and calculate metrics.
         mpnn_results = {
@@ -259,14 +342,10 @@ class Refolder:
         
         if self._sample_conf.sort_by_score:
         # Only take seqs with lowerst global score to enter refolding
-            scores = []
-            for i, (header, string) in enumerate(filtered_seqs.items()):
-                #if i == 0:
-                #    global_score = float(header.split(", ")[2].split("=")[1])
-                #    original_seq = (global_score, header, string)
-                #else:
-                global_score = float(header.split(", ")[3].split("=")[1])
-                scores.append((global_score, header, string))
+            scores = [
+                (float(_GLOBAL_SCORE_RE.search(header).group(1)), header, string)
+                for header, string in filtered_seqs.items()
+            ]
             scores.sort(key=lambda x: x[0])
 
             top_seqs_list = scores[:self._sample_conf.seq_per_sample]
@@ -287,50 +366,122 @@ class Refolder:
         seqs_dict = fasta.FastaFile.read(seqs_to_refold)
         
         sample_feats = su.parse_pdb_feats('sample', reference_pdb_path)
+        # The reference sequence is the same for every sample; derive it once
+        sample_seq = su.aatype_to_seq(sample_feats['aatype'])
         if 'ESMFold' in self._forward_folding:
             os.makedirs(esmf_dir, exist_ok=True)
-            for i, (header, string) in enumerate(seqs_dict.items()):
-                
+
+            # Parse headers once, then fold in batches so the GPU amortizes
+            # its kernels over the batch dimension instead of launching one
+            # tiny forward per sequence
+            seq_records = []
+            for header, string in seqs_dict.items():
+
                 # Get score for ProteinMPNN
-                if header.startswith("T=0"):
-                    idx = header.split('sample=')[1].split(',')[0]
-                    score = float(header.split(", ")[3].split("=")[1])
+                idx = header.split('sample=')[1].split(',')[0] if header.startswith("T=0") else 0
+                score = float(_GLOBAL_SCORE_RE.search(header).group(1))
+                seq_records.append((header, string, idx, score))
+
+            # Run ESMFold
+            self._log.info(f'Running ESMFold......')
+            # At sampling temperature 0.1 ProteinMPNN regularly emits
+            # identical sequences; fold each distinct sequence once and
+            # share its outputs with the duplicates
+            first_idx_by_seq = {}
+            duplicate_pairs = []
+            fold_records = []
+            for record in seq_records:
+                _, string, idx, _ = record
+                if string in first_idx_by_seq:
+                    duplicate_pairs.append((idx, first_idx_by_seq[string]))
                 else:
-                    idx = 0
-                    score = float(header.split(", ")[2].split("=")[1])
+                    first_idx_by_seq[string] = idx
+                    fold_records.append(record)
+
+            # Length-sorted batches keep padding waste low inside each batch;
+            # results are keyed by sample index, so the metric loop and the
+            # CSV (sorted by sample_idx at write time) are order-independent
+            fold_records.sort(key=lambda record: len(record[1]))
+
+            esmf_batch_size = self._esmf_conf.batch_size
+            folded_outputs = {}
+            # PDB serialization is pure CPU work; running it on a small
+            # thread pool overlaps it with the next batch's forward pass
+            pdb_futures = []
+            with ThreadPoolExecutor(max_workers=2) as pdb_executor:
+                for start in range(0, len(fold_records), esmf_batch_size):
+                    batch = fold_records[start:start + esmf_batch_size]
+                    batch_paths = [os.path.join(esmf_dir, f'sample_{idx}.pdb') for _, _, idx, _ in batch]
+                    pdb_future, full_output = self.run_folding(
+                        [string for _, string, _, _ in batch], batch_paths,
+                        executor=pdb_executor)
+                    pdb_futures.append(pdb_future)
+                    for j, (_, string, idx, _) in enumerate(batch):
+                        # Per-sample scalars; the pae mean must ignore the padded tail
+                        length = len(string)
+                        folded_outputs[idx] = {
+                            'sample_path': batch_paths[j],
+                            'pae': torch.mean(full_output['predicted_aligned_error'][j, :length, :length]).item(),
+                            'ptm': full_output['ptm'][j].item(),
+                            'plddt': full_output['mean_plddt'][j].item(),
+                            # CA coordinates (atom14 index 1) straight from the
+                            # model output: the scTM/RMSD metrics below then skip
+                            # re-parsing the PDB file that was just written
+                            'ca_positions': full_output['positions'][-1, j, :length, 1, :].float().numpy(),
+                        }
+
+                # Every PDB must be on disk before the duplicate linking and
+                # any downstream reads; .result() re-raises write errors
+                for pdb_future in pdb_futures:
+                    _ = pdb_future.result()
+
+            for dup_idx, src_idx in duplicate_pairs:
+                source = folded_outputs[src_idx]
+                dup_path = os.path.join(esmf_dir, f'sample_{dup_idx}.pdb')
+                try:
+                    os.link(source['sample_path'], dup_path)
+                except OSError:
+                    shutil.copy(source['sample_path'], dup_path)
+                folded_outputs[dup_idx] = {**source, 'sample_path': dup_path}
+
+            # All samples of one backbone share the same length, so their
+            # CA stacks can be aligned with one batched Kabsch call instead
+            # of one SVD per sequence. Both Kabsch and tm_align superpose
+            # internally, so the raw (uncentered) model coordinates are
+            # equivalent to the centered ones a PDB reparse would yield.
+            if seq_records:
+                pred_stack = np.stack(
+                    [folded_outputs[idx]['ca_positions'] for _, _, idx, _ in seq_records])
+                sample_stack = np.broadcast_to(
+                    sample_feats['bb_positions'], pred_stack.shape)
+                rmsds = su.calc_aligned_rmsd_batch(sample_stack, pred_stack)
+                if motif_mask is not None:
+                    motif_rmsds = su.calc_aligned_rmsd_batch(
+                        sample_stack[:, motif_mask], pred_stack[:, motif_mask])
 
-                # Run ESMFold
-                self._log.info(f'Running ESMFold......')
-                esmf_sample_path = os.path.join(esmf_dir, f'sample_{idx}.pdb')
-                _, full_output = self.run_folding(string, esmf_sample_path)
-                esmf_feats = su.parse_pdb_feats('folded_sample', esmf_sample_path)
-                sample_seq = su.aatype_to_seq(sample_feats['aatype'])
+            for k, (header, string, idx, score) in enumerate(seq_records):
+                esmf_sample_path = folded_outputs[idx]['sample_path']
 
                 # Calculate scTM of ESMFold outputs with reference protein
                 _, tm_score = su.calc_tm_score(
-                    sample_feats['bb_positions'], esmf_feats['bb_positions'],
+                    sample_feats['bb_positions'], pred_stack[k],
                     sample_seq, sample_seq)
-                rmsd = su.calc_aligned_rmsd(
-                    sample_feats['bb_positions'], esmf_feats['bb_positions'])
-                pae = torch.mean(full_output['predicted_aligned_error']).item()
-                ptm = full_output['ptm'].item()
-                plddt = full_output['mean_plddt'].item()
+                rmsd = rmsds[k]
+                pae = folded_outputs[idx]['pae']
+                ptm = folded_outputs[idx]['ptm']
+                plddt = folded_outputs[idx]['plddt']
                 if motif_mask is not None:
-                    sample_motif = sample_feats['bb_positions'][motif_mask]
-                    esm_motif = esmf_feats['bb_positions'][motif_mask]
-                    motif_rmsd = su.calc_aligned_rmsd(
-                        sample_motif, esm_motif)
-                    mpnn_results['motif_rmsd'].append(f'{motif_rmsd:.3f}')
-                mpnn_results['rmsd'].append(f'{rmsd:.3f}')
-                mpnn_results['tm_score'].append(f'{tm_score:.3f}')
+                    mpnn_results['motif_rmsd'].append(motif_rmsds[k])
+                mpnn_results['rmsd'].append(rmsd)
+                mpnn_results['tm_score'].append(tm_score)
                 mpnn_results['sample_path'].append(os.path.abspath(esmf_sample_path))
                 mpnn_results['header'].append(header)
                 mpnn_results['sequence'].append(string)
-                mpnn_results['pae'].append(f'{pae:.3f}')
-                mpnn_results['ptm'].append(f'{ptm:.3f}')
-                mpnn_results['plddt'].append(f'{plddt:.3f}')
+                mpnn_results['pae'].append(pae)
+                mpnn_results['ptm'].append(ptm)
+                mpnn_results['plddt'].append(plddt)
                 mpnn_results['length'].append(len(string))
-                mpnn_results['mpnn_score'].append(f'{score:.3f}')
+                mpnn_results['mpnn_score'].append(score)
                 mpnn_results['sample_idx'].append(int(idx))
 
             # Save results to CSV
@@ -339,12 +490,18 @@ class Refolder:
             #esm_columns = ['sample_idx'] + [c for c in mpnn_results.columns if c != 'sample_idx']
             #mpnn_results = mpnn_results.reindex(columns=esm_columns)
             mpnn_results.sort_values('sample_idx', inplace=True)
-            mpnn_results.to_csv(esm_csv_path, index=False)
+            # Format once at write time; the columns stay numeric in memory
+            mpnn_results.to_csv(esm_csv_path, float_format='%.3f', index=False)
 
         # Run AF2
         if 'AlphaFold2' in self._forward_folding:
             self._log.info(f'Running AlphaFold2......')
 
+            # Trim the caching allocator once before handing the GPU to the
+            # AF2 subprocess; doing this inside every retry handler forced a
+            # device sync and pushed later allocations back to cudaMalloc
+            if 'cuda' in self.device and torch.cuda.memory_reserved() > (1 << 30):
+                torch.cuda.empty_cache()
             _ = self.run_af2(seqs_to_refold, af2_raw_dir)
             af2_dir = os.path.join(decoy_pdb_dir, 'af2')
             os.makedirs(af2_dir, exist_ok=True)
@@ -355,16 +512,11 @@ class Refolder:
 
             for i, (header, string) in enumerate(seqs_dict.items()):
                 # Find index and score
-                if header.startswith("T=0"):
-                    idx = header.split('sample=')[1].split(',')[0]
-                    score = float(header.split(", ")[3].split("=")[1])
-                else:
-                    idx = 0
-                    score = float(header.split(", ")[2].split("=")[1])
+                idx = header.split('sample=')[1].split(',')[0] if header.startswith("T=0") else 0
+                score = float(_GLOBAL_SCORE_RE.search(header).group(1))
 
                 af2_sample_path = os.path.join(af2_dir, f'sample_{idx}.pdb')
                 af2_feats = su.parse_pdb_feats('folded_sample', af2_sample_path)
-                sample_seq = su.aatype_to_seq(sample_feats['aatype'])
 
                 # Calculation
                 _, tm_score = su.calc_tm_score(
@@ -377,12 +529,12 @@ class Refolder:
                     af2_motif = af2_feats['bb_positions'][motif_mask]
                     motif_rmsd = su.calc_aligned_rmsd(
                         sample_motif, af2_motif)
-                af2_outputs[f'sample_{idx}']['rmsd'] = f'{rmsd:.3f}'
-                af2_outputs[f'sample_{idx}']['tm_score'] = f'{tm_score:.3f}'
+                af2_outputs[f'sample_{idx}']['rmsd'] = rmsd
+                af2_outputs[f'sample_{idx}']['tm_score'] = tm_score
                 af2_outputs[f'sample_{idx}']['header'] = header
                 af2_outputs[f'sample_{idx}']['sequence'] = string
                 af2_outputs[f'sample_{idx}']['length'] = len(string)
-                af2_outputs[f'sample_{idx}']['mpnn_score'] = f'{score:.3f}'
+                af2_outputs[f'sample_{idx}']['mpnn_score'] = score
                 af2_outputs[f'sample_{idx}']['sample_idx'] = int(idx)
             print(f'final_outputs: {af2_outputs}')
             af2_csv_path = os.path.join(decoy_pdb_dir, 'af2_eval_results.csv')
@@ -394,7 +546,7 @@ class Refolder:
             #af2_columns = ['sample_idx'] + [c for c in af2_df.columns if c != 'sample_idx']
             #af2_df = af2_df.reindex(columns=af2_columns)
             af2_df.sort_values('sample_idx', inplace=True)
-            af2_df.to_csv(af2_csv_path, index=False)
+            af2_df.to_csv(af2_csv_path, float_format='%.3f', index=False)
 
         if 'ESMFold' in self._forward_folding and 'AlphaFold2' in self._forward_folding:
             esm_results = pd.read_csv(esm_csv_path)
@@ -406,18 +558,44 @@ class Refolder:
 
 
 
-    def run_folding(self, sequence, save_path):
+    def run_folding(self, sequences, save_paths, executor=None):
         """
-        Run ESMFold on sequence.
+        Run ESMFold on a batch of sequences.
+        Single strings / paths are accepted for backwards compatibility.
+        When an executor is given, PDB serialization and writing run on it
+        and a future replaces the pdb string list in the return value, so
+        the caller can overlap them with the next forward pass.
         TBD: Add options for OmegaFold and AlphaFold2.
         """
-        with torch.no_grad():
-            output = self._folding_model.infer(sequence)
-            output_dict = {key: value.cpu() for key, value in output.items()}
-            output = self._folding_model.output_to_pdb(output)
-        with open(save_path, "w") as f:
-            f.write(output[0])
-        return output, output_dict  
+        if isinstance(sequences, str):
+            sequences = [sequences]
+        if isinstance(save_paths, (str, Path)):
+            save_paths = [save_paths]
+        # Only the tensors consumed downstream leave the GPU: the metric
+        # scalars/coordinates plus the per-residue fields output_to_pdb
+        # indexes. The large intermediates (pair representation,
+        # distogram/LM logits, frames) stay on-device and are freed
+        # together with `output`
+        needed_keys = (
+            'positions', 'predicted_aligned_error', 'ptm', 'mean_plddt',
+            'aatype', 'atom37_atom_exists', 'residx_atom37_to_atom14',
+            'residue_index', 'plddt', 'chain_index',
+        )
+        with torch.inference_mode():
+            output = self._folding_model.infer(sequences)
+            output_dict = {key: output[key].cpu() for key in needed_keys if key in output}
+
+        def _serialize():
+            # Pure CPU work on the host copies; safe to run off-thread
+            pdb_strings = self._folding_model.output_to_pdb(output_dict)
+            for save_path, pdb_string in zip(save_paths, pdb_strings):
+                with open(save_path, "w") as f:
+                    f.write(pdb_string)
+            return pdb_strings
+
+        if executor is not None:
+            return executor.submit(_serialize), output_dict
+        return _serialize(), output_dict
 
     def run_af2(self, sequence, save_path):
         """
@@ -468,7 +646,6 @@ class Refolder:
             except Exception as e:
                 num_tries_af2 += 1
                 self._log.info(f'Hmm...Maybe some error occurs during executing AlphaFold2. Tried {num_tries_af2}/5')
-                torch.cuda.empty_cache()
                 if num_tries_af2 > 10:
                     raise e
 